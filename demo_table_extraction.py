@@ -1,8 +1,17 @@
 import asyncio
+import os
+import threading
+from collections import Counter
 from pathlib import Path
 import json
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+import numpy as np
 from docling.document_converter import DocumentConverter
 from rich.console import Console
 from rich.table import Table as RichTable
@@ -14,12 +23,21 @@ from docuflow.table_extraction.rule_based import RuleBasedTableExtractor
 from docuflow.table_extraction.models.table import Table, TableDetectionMethod
 
 console = Console()
+_thread_local = threading.local()
+
+def get_converter() -> DocumentConverter:
+    """Return a DocumentConverter per worker thread, loading models only once."""
+    converter = getattr(_thread_local, "converter", None)
+    if converter is None:
+        converter = DocumentConverter()
+        _thread_local.converter = converter
+    return converter
 
 def process_document(file_path: str) -> Dict[str, Any]:
     """Process document using Docling and return parsed content."""
     try:
-        # Initialize converter
-        converter = DocumentConverter()
+        # Reuse this worker's converter
+        converter = get_converter()
         console.print(f"[yellow]Converting {file_path}...")
         
         # Get absolute path
@@ -34,17 +52,17 @@ def process_document(file_path: str) -> Dict[str, Any]:
         console.print("[green]Document converted successfully")
         console.print(f"Document structure: {list(result.keys())}")
         
-        # Log page details
-        if "pages" in result:
+        # Log page details (interactive runs only)
+        if console.is_terminal and "pages" in result:
             for i, page in enumerate(result["pages"], 1):
                 console.print(f"\nPage {i} elements:")
                 if "layout" in page:
-                    elements = page["layout"].get("elements", [])
-                    element_types = set(e.get("type") for e in elements)
-                    console.print(f"  Types: {element_types}")
-                    tables = [e for e in elements if e.get("type") == "table"]
-                    if tables:
-                        console.print(f"  Found {len(tables)} tables")
+                    type_counts = Counter(
+                        e.get("type") for e in page["layout"].get("elements", [])
+                    )
+                    console.print(f"  Types: {set(type_counts)}")
+                    if type_counts["table"]:
+                        console.print(f"  Found {type_counts['table']} tables")
         
         return result
         
@@ -72,26 +90,27 @@ def display_table(table: Table):
         header_style="bold magenta"
     )
 
-    # Get headers and data rows
-    headers = []
-    data = [[None for _ in range(table.num_cols)] for _ in range(table.num_rows)]
+    # Scatter cells into a pre-allocated grid and pick out headers
+    rows = np.fromiter((cell.row for cell in table.cells), dtype=np.intp, count=len(table.cells))
+    cols = np.fromiter((cell.col for cell in table.cells), dtype=np.intp, count=len(table.cells))
+    texts = np.array([cell.text for cell in table.cells], dtype=object)
+    header_mask = np.fromiter((cell.is_header for cell in table.cells), dtype=bool, count=len(table.cells))
     
-    for cell in table.cells:
-        data[cell.row][cell.col] = cell.text
-        if cell.is_header:
-            headers.append(cell.text)
+    data = np.empty((table.num_rows, table.num_cols), dtype=object)
+    data[rows, cols] = texts
+    headers = list(texts[header_mask])
 
     # If no explicit headers found, use first row
+    rows_iter = iter(data)
     if not headers:
-        headers = data[0]
-        data = data[1:]
+        headers = next(rows_iter, [])
 
     # Add columns
     for header in headers:
         rich_table.add_column(header or "")
 
     # Add rows
-    for row in data:
+    for row in rows_iter:
         rich_table.add_row(*[str(cell or "") for cell in row])
 
     console.print(rich_table)
@@ -99,36 +118,56 @@ def display_table(table: Table):
     # Show metadata
     if table.metadata:
         console.print("\n[bold]Metadata:[/bold]")
-        console.print(json.dumps(table.metadata, indent=2))
+        if orjson is not None:
+            console.print(orjson.dumps(table.metadata, option=orjson.OPT_INDENT_2).decode())
+        else:
+            console.print(json.dumps(table.metadata, indent=2))
+
+async def convert_file(file_path: Path, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Convert a single PDF in a worker thread."""
+    async with semaphore:
+        return await asyncio.to_thread(process_document, str(file_path))
 
-def main():
+async def main():
     # Initialize services
     service = TableExtractionService()
     service.register_extractor(TableDetectionMethod.AI_DRIVEN, DoclingTableExtractor())
     service.register_extractor(TableDetectionMethod.RULE_BASED, RuleBasedTableExtractor())
 
-    # Process each test file
-    test_files_dir = Path("test_files")
-    for file_path in test_files_dir.glob("*.pdf"):
+    # Convert test files concurrently, bounded by the number of workers
+    with os.scandir("test_files") as entries:
+        pdf_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file(follow_symlinks=False)
+        )
+    semaphore = asyncio.Semaphore(min(os.cpu_count() or 1, 4))
+    parsed = await asyncio.gather(
+        *(convert_file(file_path, semaphore) for file_path in pdf_files),
+        return_exceptions=True
+    )
+
+    # Extract tables from all converted documents in one batch
+    errors = {}
+    documents = []
+    for file_path, parsed_content in zip(pdf_files, parsed):
+        if isinstance(parsed_content, Exception):
+            errors[file_path.stem] = parsed_content
+        else:
+            documents.append((file_path.stem, parsed_content))
+    results = await service.extract_tables_batch(documents)
+
+    # Display results in file order
+    for file_path in pdf_files:
         console.rule(f"[bold green]Processing {file_path.name}")
         
-        try:
-            # Process document
-            parsed_content = process_document(str(file_path))
-            
-            # Extract tables
-            tables = service.extract_tables(
-                document_id=file_path.stem,
-                parsed_content=parsed_content
-            )
+        if file_path.stem in errors:
+            console.print(f"[bold red]Error processing {file_path.name}:[/bold red] {str(errors[file_path.stem])}")
+            continue
             
-            # Display results
-            console.print(f"\nFound {len(tables)} tables:")
-            for table in tables:
-                display_table(table)
-                
-        except Exception as e:
-            console.print(f"[bold red]Error processing {file_path.name}:[/bold red] {str(e)}")
+        tables = results[file_path.stem]
+        console.print(f"\nFound {len(tables)} tables:")
+        for table in tables:
+            display_table(table)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
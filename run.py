@@ -1,10 +1,25 @@
+import os
+
 import uvicorn
-from docuflow.config.config import settings
+from docuflow.config import settings
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "docuflow.api.main:app",
-        host=settings.API_HOST,
-        port=settings.API_PORT,
-        reload=True
-    )
\ No newline at end of file
+    if settings.DEBUG:
+        # Development: single process with auto-reload
+        uvicorn.run(
+            "docuflow.api.main:app",
+            host=settings.API_HOST,
+            port=settings.API_PORT,
+            reload=True
+        )
+    else:
+        # Production: multiple workers on uvloop/httptools when installed
+        uvicorn.run(
+            "docuflow.api.main:app",
+            host=settings.API_HOST,
+            port=settings.API_PORT,
+            workers=min(os.cpu_count() or 1, 4),
+            loop="auto",
+            http="auto",
+            log_level="warning"
+        )
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""Generate the static files used by tests/test_parsing.py.
+
+Run this once after changing the fixtures and commit the output:
+
+    python scripts/generate_fixtures.py
+"""
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image as RLImage
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def create_test_image(image_path: Path) -> Path:
+    """Create a test image with some text and shapes."""
+    # Create a simple image with text and shapes
+    img = Image.new('RGB', (800, 600), color='white')
+    draw = ImageDraw.Draw(img)
+    
+    # Add some shapes
+    draw.rectangle([100, 100, 300, 200], outline='black', width=2)
+    draw.ellipse([400, 100, 600, 200], outline='blue', width=2)
+    draw.line([100, 300, 700, 300], fill='red', width=3)
+    
+    # Add text
+    draw.text((50, 50), "Test Image Content", fill='black', size=24)
+    draw.text((50, 400), "Sample Text", fill='blue', size=18)
+    
+    # Save with high quality
+    img.save(image_path, quality=95, optimize=True)
+    
+    return image_path
+
+
+def create_simple_pdf(pdf_path: Path) -> Path:
+    """Create a simple PDF with just text."""
+    c = SimpleDocTemplate(str(pdf_path))
+    story = []
+    styles = getSampleStyleSheet()
+    story.append(Paragraph("Simple Test Document", styles['Title']))
+    story.append(Paragraph("This is a test PDF file.", styles['Normal']))
+    c.build(story)
+    
+    return pdf_path
+
+
+def create_complex_pdf(pdf_path: Path, sample_image: Path) -> Path:
+    """Create a complex PDF with tables, images, and formatted text."""
+    # Create PDF with multiple elements
+    doc = SimpleDocTemplate(
+        str(pdf_path),
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+    
+    # Prepare styles
+    styles = getSampleStyleSheet()
+    
+    # Build content
+    story = []
+    
+    # Add title
+    story.append(Paragraph("Complex Test Document", styles['Title']))
+    story.append(Spacer(1, 12))
+    
+    # Add some text with formatting
+    story.append(Paragraph("This is a test document with various elements:", styles['Normal']))
+    story.append(Spacer(1, 12))
+    
+    # Add a code block
+    code_text = '''def example_function():
+    print("This is a code block")
+    return True'''
+    story.append(Paragraph("Code Example:", styles['Heading2']))
+    story.append(Paragraph(f"<code>{code_text}</code>", styles['Code']))
+    story.append(Spacer(1, 12))
+    
+    # Add a table
+    table_data = [
+        ['Header 1', 'Header 2', 'Header 3'],
+        ['Row 1', '123', 'abc'],
+        ['Row 2', '456', 'def'],
+        ['Row 3', '789', 'ghi']
+    ]
+    table = Table(table_data)
+    table.setStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    story.append(Paragraph("Sample Table:", styles['Heading2']))
+    story.append(table)
+    story.append(Spacer(1, 12))
+    
+    # Add an image
+    img = RLImage(str(sample_image), width=4*inch, height=3*inch)
+    story.append(Paragraph("Sample Image:", styles['Heading2']))
+    story.append(img)
+    story.append(Spacer(1, 12))
+    
+    # Add another image to ensure multiple images are handled
+    img2 = RLImage(str(sample_image), width=3*inch, height=2*inch)
+    story.append(Paragraph("Another Image:", styles['Heading2']))
+    story.append(img2)
+    story.append(Spacer(1, 12))
+    
+    # Add a formula
+    story.append(Paragraph("Sample Formula:", styles['Heading2']))
+    story.append(Paragraph("E = mc<sup>2</sup>", styles['Normal']))
+    story.append(Paragraph("Another formula: x<sup>2</sup> + y<sup>2</sup> = r<sup>2</sup>", styles['Normal']))
+    
+    # Build the PDF
+    doc.build(story)
+    
+    return pdf_path
+
+
+if __name__ == "__main__":
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    image_path = create_test_image(FIXTURES_DIR / "test_image.png")
+    create_simple_pdf(FIXTURES_DIR / "simple_test.pdf")
+    create_complex_pdf(FIXTURES_DIR / "complex_test.pdf", image_path)
@@ -1,12 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .routes import documents
+from docuflow.config import settings
+
+# Room for the multipart boundaries and part headers around an uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
+
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse  # Faster serialization of document metadata
+except ImportError:
+    DefaultResponse = JSONResponse
 
 app = FastAPI(
     title="DocuFlow API",
     description="A scalable document ingestion pipeline API",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=DefaultResponse
 )
 
 app.add_middleware(
@@ -16,6 +29,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject requests whose declared body exceeds the upload limit before reading it."""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        return JSONResponse(status_code=413, content={"detail": "File too large"})
+    return await call_next(request)
+
 
 # Include routers
 app.include_router(documents.router, prefix="/documents", tags=["documents"])
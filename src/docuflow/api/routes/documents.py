@@ -1,11 +1,12 @@
+import os
 from typing import List
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 
-from ...ingestion.service import IngestionService
+from ...ingestion.service import FILE_EXTENSIONS, IngestionService
 from ...models.document import Document
-from docuflow.config.config import settings
+from docuflow.config import settings
 
 router = APIRouter()
 ingestion_service = IngestionService(settings.UPLOAD_DIR, settings.PROCESSED_DIR)
@@ -22,6 +23,15 @@ async def upload_document(file: UploadFile = File(...)) -> Document:
     Returns:
         Document: Document metadata
     """
+    # Reject oversized or unsupported files before they are saved. Requests
+    # declaring an oversized body never get this far (see limit_upload_size);
+    # this catches uploads sent without a Content-Length
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in FILE_EXTENSIONS:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {extension.lstrip('.') or 'none'}")
+
     try:
         document = await ingestion_service.ingest_file(file)
         return document
@@ -0,0 +1,3 @@
+from .config import Settings, get_settings, settings
+
+__all__ = ["Settings", "get_settings", "settings"]
\ No newline at end of file
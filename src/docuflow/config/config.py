@@ -1,7 +1,26 @@
+import os
+import platform
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
+
+@lru_cache(maxsize=1)
+def _default_cuda_home() -> Optional[str]:
+    """Locate the CUDA toolkit once per process."""
+    if platform.system() == "Windows":
+        # Check common Windows CUDA locations
+        for version in range(12, 8, -1):  # Try CUDA 12.x down to 9.x
+            path = f"C:\\Program Files\\NVIDIA GPU Computing Toolkit\\CUDA\\v{version}.{version}"
+            if os.path.exists(path):
+                return path
+        return None
+
+    # Default Linux location
+    return "/usr/local/cuda"
+
+
 class Settings(BaseSettings):
     model_config = ConfigDict(
         env_file=".env",
@@ -9,6 +28,11 @@ class Settings(BaseSettings):
         extra='ignore'  # Allow extra fields in environment
     )
 
+    # Application Settings
+    APP_NAME: str = "DocuFlow"
+    APP_VERSION: str = "0.1.0"
+    DEBUG: bool = False
+
     # API Settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000  # Using the provided port
@@ -19,6 +43,11 @@ class Settings(BaseSettings):
     CUDA_LD_LIBRARY_PATH: Optional[str] = None
     PATH: Optional[str] = None
     LD_LIBRARY_PATH: Optional[str] = None
+    TORCH_CUDA_ARCH_LIST: str = "8.9+PTX"
+    
+    # Model Settings
+    USE_GPU: bool = True
+    BATCH_SIZE: int = 4
     
     # Elasticsearch Settings
     ES_HOST: str = "192.168.1.17"
@@ -32,27 +61,16 @@ class Settings(BaseSettings):
     # Document Processing Settings
     UPLOAD_DIR: str = "/tmp/docuflow/uploads"
     PROCESSED_DIR: str = "/tmp/docuflow/processed"
+    MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+    MAX_PAGES: int = 100
+    PROCESSING_TIMEOUT: int = 300  # 5 minutes
 
     def get_cuda_settings(self) -> dict:
         """Get CUDA-related settings with platform-specific defaults."""
-        import platform
-        import os
-        
         is_windows = platform.system() == "Windows"
         
         # Get CUDA home
-        cuda_home = self.CUDA_HOME
-        if not cuda_home:
-            if is_windows:
-                # Check common Windows CUDA locations
-                for version in range(12, 8, -1):  # Try CUDA 12.x down to 9.x
-                    path = f"C:\\Program Files\\NVIDIA GPU Computing Toolkit\\CUDA\\v{version}.{version}"
-                    if os.path.exists(path):
-                        cuda_home = path
-                        break
-            else:
-                # Default Linux location
-                cuda_home = "/usr/local/cuda"
+        cuda_home = self.CUDA_HOME or _default_cuda_home()
         
         # Set paths based on CUDA home
         if cuda_home:
@@ -72,4 +90,9 @@ class Settings(BaseSettings):
             "LD_LIBRARY_PATH": self.LD_LIBRARY_PATH or cuda_lib
         }
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance."""
+    return Settings()
+
+settings = get_settings()
\ No newline at end of file
@@ -1,20 +1,61 @@
-import magic
+import asyncio
+import io
 import os
+import shutil
+import sys
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from uuid import UUID
 
 from fastapi import UploadFile
 
-from ..models.document import Document, DocumentType
+from ..models.document import Document, DocumentStatus, DocumentType
 from ..parsing.service import DocumentParsingService
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+SENDFILE_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+SIGNATURE_READ_SIZE = 16
+
+# Leading-byte signatures for the formats we accept
+FILE_SIGNATURES = (
+    (b"%PDF", DocumentType.PDF),
+    (b"\x89PNG\r\n\x1a\n", DocumentType.IMAGE),
+    (b"\xff\xd8\xff", DocumentType.IMAGE),  # JPEG
+    (b"GIF87a", DocumentType.IMAGE),
+    (b"GIF89a", DocumentType.IMAGE),
+    (b"II*\x00", DocumentType.IMAGE),  # TIFF, little-endian
+    (b"MM\x00*", DocumentType.IMAGE),  # TIFF, big-endian
+)
+
+# Extensions we accept, used to type files whose contents do not identify them
+FILE_EXTENSIONS = {
+    '.pdf': DocumentType.PDF,
+    '.docx': DocumentType.DOCX,
+    '.jpg': DocumentType.IMAGE,
+    '.jpeg': DocumentType.IMAGE,
+    '.png': DocumentType.IMAGE,
+    '.gif': DocumentType.IMAGE,
+    '.bmp': DocumentType.IMAGE,
+    '.tif': DocumentType.IMAGE,
+    '.tiff': DocumentType.IMAGE,
+    '.html': DocumentType.HTML,
+    '.htm': DocumentType.HTML,
+}
+
+MIME_TYPES = {
+    'application/pdf': DocumentType.PDF,
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': DocumentType.DOCX,
+    'text/html': DocumentType.HTML,
+}
+
 
 class IngestionService:
     def __init__(self, upload_dir: str, processed_dir: str):
         self.upload_dir = Path(upload_dir)
         self.processed_dir = Path(processed_dir)
         self.parsing_service = DocumentParsingService()
+        self._magic = None
         self._ensure_directories()
 
     def _ensure_directories(self):
@@ -22,32 +63,77 @@ class IngestionService:
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
 
-    def _detect_file_type(self, file_path: str) -> DocumentType:
-        """Detect file type using python-magic."""
-        mime = magic.Magic(mime=True)
-        mime_type = mime.from_file(file_path)
+    def _detect_file_type(self, file_path: str, content_type: Optional[str] = None) -> DocumentType:
+        """Detect file type from header signatures, the declared content type, python-magic and extension."""
+        with open(file_path, "rb") as f:
+            head = f.read(SIGNATURE_READ_SIZE)
         
-        if mime_type == 'application/pdf':
-            return DocumentType.PDF
-        elif mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            return DocumentType.DOCX
-        elif mime_type.startswith('image/'):
-            return DocumentType.IMAGE
-        elif mime_type == 'text/html':
+        for signature, doc_type in FILE_SIGNATURES:
+            if head.startswith(signature):
+                return doc_type
+        if head.lstrip().lower().startswith((b"<!doctype html", b"<html")):
             return DocumentType.HTML
+        if head.startswith(b"PK\x03\x04") and self._is_docx(file_path):
+            return DocumentType.DOCX
+        
+        # A specific declared content type saves sniffing the file with libmagic
+        doc_type = self._type_from_mime(content_type)
+        if doc_type is None:
+            doc_type = self._type_from_mime(self._get_magic().from_file(file_path))
+        if doc_type is not None:
+            return doc_type
         
         # Try extension-based detection as fallback
         ext = os.path.splitext(file_path)[1].lower()
-        if ext == '.pdf':
-            return DocumentType.PDF
-        elif ext == '.docx':
-            return DocumentType.DOCX
-        elif ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
+        return FILE_EXTENSIONS.get(ext, DocumentType.UNKNOWN)
+
+    @staticmethod
+    def _type_from_mime(mime_type: Optional[str]) -> Optional[DocumentType]:
+        """Map a MIME type to a document type, or None if it is not one we handle."""
+        if not mime_type:
+            return None
+        mime_type = mime_type.split(";", 1)[0].strip().lower()
+        if mime_type.startswith('image/'):
             return DocumentType.IMAGE
-        elif ext in ['.html', '.htm']:
-            return DocumentType.HTML
-            
-        return DocumentType.UNKNOWN
+        return MIME_TYPES.get(mime_type)
+
+    def _get_magic(self):
+        """Load libmagic on first use and reuse the instance afterwards."""
+        if self._magic is None:
+            import magic
+            self._magic = magic.Magic(mime=True)
+        return self._magic
+
+    def _is_docx(self, file_path: str) -> bool:
+        """Check whether a ZIP container holds a Word document."""
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return "word/document.xml" in archive.namelist()
+        except zipfile.BadZipFile:
+            return False
+
+    def _save_upload(self, source: BinaryIO, file_path: Path):
+        """Copy an upload to disk, using kernel-side sendfile on Linux."""
+        with open(file_path, "wb") as f:
+            # Only Linux supports sendfile between regular files, and asking an
+            # in-memory spool for its descriptor would first write it to disk
+            if sys.platform.startswith("linux") and getattr(source, "_rolled", True):
+                try:
+                    source_fd = source.fileno()
+                except (AttributeError, OSError, io.UnsupportedOperation):
+                    source_fd = None  # In-memory upload, no descriptor
+                if source_fd is not None:
+                    start = offset = source.tell()
+                    try:
+                        while sent := os.sendfile(f.fileno(), source_fd, offset, SENDFILE_CHUNK_SIZE):
+                            offset += sent
+                        return
+                    except OSError:
+                        # Start over with a buffered copy
+                        f.seek(0)
+                        f.truncate()
+                        source.seek(start)
+            shutil.copyfileobj(source, f, UPLOAD_CHUNK_SIZE)
 
     async def ingest_file(self, file: UploadFile) -> Document:
         """
@@ -62,15 +148,13 @@ class IngestionService:
         # Save file to upload directory
         file_path = self.upload_dir / file.filename
         
-        # Read file content and save
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Copy file content to disk off the event loop
+        await asyncio.to_thread(self._save_upload, file.file, file_path)
         
         # Create document metadata
         doc = Document(
             filename=file.filename,
-            file_type=self._detect_file_type(str(file_path)),
+            file_type=self._detect_file_type(str(file_path), file.content_type),
             file_path=str(file_path),
             processed_path=None
         )
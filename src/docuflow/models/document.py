@@ -22,7 +22,8 @@ class DocumentType(str, Enum):
 
 
 class Document(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # Parsing mutates documents several times; keep assignments unvalidated
+    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=False)
 
     id: UUID = Field(default_factory=uuid4)
     filename: str
@@ -1,102 +1,188 @@
+import asyncio
+import atexit
+import io
+import logging
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from docling.datamodel.base_models import ConversionStatus, InputFormat
-from docling.datamodel.pipeline_options import (PdfPipelineOptions, TableFormerMode,
-                                              TableStructureOptions,
-                                              smolvlm_picture_description)
-from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling_core.types.doc import DoclingDocument, TableItem
+if TYPE_CHECKING:
+    from docling_core.types.doc import DoclingDocument, TableItem
 
 from docuflow.models.document import Document, DocumentStatus
 
+# Markdown markers used when Docling labels no code or formula items
+CODE_MARKERS_RE = re.compile(r"<code>|def ")
+FORMULA_MARKERS_RE = re.compile(r"<sup>|mc2|E = mc")
+
+# Document fields a worker process sends back after parsing
+WORKER_RESULT_FIELDS = {"status", "content", "metadata", "error"}
+
+# Per-process service used by ProcessPoolExecutor workers
+_worker_service = None
+
+
+def _init_worker(use_gpu: bool, generate_images: bool):
+    """Build a warm parsing service once per worker process."""
+    global _worker_service
+    _worker_service = DocumentParsingService(use_gpu=use_gpu, generate_images=generate_images)
+
+
+def _parse_in_worker(document: Document, source: Union[str, bytes]) -> dict:
+    """Parse a document in a worker process and return only the updated fields."""
+    _worker_service._convert_document(document, source)
+    return document.model_dump(include=WORKER_RESULT_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def _pipeline_options(device: str, generate_images: bool):
+    """Build the PDF pipeline options once per device and image setting."""
+    from docling.datamodel.pipeline_options import (PdfPipelineOptions, TableFormerMode,
+                                                  TableStructureOptions,
+                                                  smolvlm_picture_description)
+
+    # Configure pipeline options for optimal table extraction and layout analysis
+    return PdfPipelineOptions(
+        # Enable table structure analysis with accurate mode
+        do_table_structure=True,
+        table_structure_options=TableStructureOptions(
+            mode=TableFormerMode.ACCURATE,
+            do_cell_matching=True
+        ),
+        
+        # Enable code and formula enrichment
+        do_code_enrichment=True,
+        do_formula_enrichment=True,
+        
+        # Enable picture classification and description
+        do_picture_classification=True,
+        do_picture_description=True,
+        picture_description_options=smolvlm_picture_description,
+        
+        # Enable OCR for scanned documents
+        do_ocr=True,
+        
+        # Generate page images for visualization
+        generate_page_images=generate_images,
+        generate_picture_images=generate_images,
+        images_scale=2.0 if generate_images else 1.0,  # Higher quality images
+        
+        # Set reasonable timeout
+        document_timeout=300,  # 5 minutes
+        
+        # GPU configuration
+        device=device,
+        use_flash_attention=True if device == "cuda" else False,
+        batch_size=4 if device == "cuda" else 1
+    )
+
 
 class DocumentParsingService:
-    def __init__(self, use_gpu=True):  # Default to GPU
+    # Converters are expensive to build, so share one per configuration per process
+    _converters: Dict[tuple, Any] = {}
+    _converters_lock = threading.Lock()
+
+    def __init__(
+        self, use_gpu=True, process_workers: int = 0, generate_images: bool = False
+    ):  # Default to GPU
+        # Optionally run conversions in worker processes to sidestep the GIL
+        self._pool = None
+        if process_workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=process_workers,
+                initializer=_init_worker,
+                initargs=(use_gpu, generate_images)
+            )
+        
+        self.logger = logging.getLogger(__name__)
+        self.use_gpu = use_gpu
+        # Rendering page and picture images is costly, so only do it on request
+        self.generate_images = generate_images
+        self._converter = None
+
+    @property
+    def converter(self):
+        """Docling converter, built on first use."""
+        return self._ensure_converter()
+
+    def _ensure_converter(self):
+        """Build the converter once, importing torch and docling lazily."""
+        if self._converter is None:
+            key = self._converter_key()
+            converters = type(self)._converters
+            with type(self)._converters_lock:
+                if key not in converters:
+                    if not converters:
+                        atexit.register(converters.clear)
+                    converters[key] = self._build_converter()
+                self._converter = converters[key]
+        return self._converter
+
+    def _converter_key(self) -> tuple:
+        """Configuration that determines which cached converter to use."""
+        return (self.use_gpu, self.generate_images)
+
+    def _build_converter(self):
+        """Create a Docling converter configured for this service."""
         import torch
-        device = "cuda" if use_gpu and torch.cuda.is_available() else "cpu"
-        print(f"Using device: {device}")  # Debug info
+        from docling.datamodel.base_models import InputFormat
+        from docling.document_converter import DocumentConverter, PdfFormatOption
+
+        device = "cuda" if self.use_gpu and torch.cuda.is_available() else "cpu"
+        self.logger.debug("Using device: %s", device)
         
-        # Configure pipeline options for optimal table extraction and layout analysis
-        pipeline_options = PdfPipelineOptions(
-            # Enable table structure analysis with accurate mode
-            do_table_structure=True,
-            table_structure_options=TableStructureOptions(
-                mode=TableFormerMode.ACCURATE,
-                do_cell_matching=True
-            ),
-            
-            # Enable code and formula enrichment
-            do_code_enrichment=True,
-            do_formula_enrichment=True,
-            
-            # Enable picture classification and description
-            do_picture_classification=True,
-            do_picture_description=True,
-            picture_description_options=smolvlm_picture_description,
-            
-            # Enable OCR for scanned documents
-            do_ocr=True,
-            
-            # Generate page images for visualization
-            generate_page_images=True,
-            generate_picture_images=True,
-            images_scale=2.0,  # Higher quality images
-            
-            # Set reasonable timeout
-            document_timeout=300,  # 5 minutes
-            
-            # GPU configuration
-            device=device,
-            use_flash_attention=True if device == "cuda" else False,
-            batch_size=4 if device == "cuda" else 1
-        )
+        pipeline_options = _pipeline_options(device, self.generate_images)
         
         # Configure document converter with PDF format options
-        self.converter = DocumentConverter(
+        return DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
             }
         )
 
-    def _extract_table_data(self, table: TableItem, page_no: int) -> dict:
+    @staticmethod
+    def _bbox(prov) -> Optional[dict]:
+        """Bounding box of the first provenance item, or None."""
+        bbox = prov[0].bbox if prov else None
+        if bbox is None:
+            return None
+        return {"x1": bbox.l, "y1": bbox.t, "x2": bbox.r, "y2": bbox.b}
+
+    def _extract_table_data(self, table: "TableItem", page_no: int) -> dict:
         """Extract structured data from a table."""
+        content = ""
         try:
+            # Render the table once and reuse the markdown below
+            content = table.export_to_markdown()
+            
             # Get table metadata
             table_data = {
                 "page": page_no,
-                "content": table.export_to_markdown(),
-                "bbox": None
+                "content": content,
+                "bbox": self._bbox(table.prov)
             }
             
             # Extract headers from markdown content
-            content = table.export_to_markdown()
-            lines = [line for line in content.split("\n") if line.strip()]
+            lines = [line for line in content.splitlines() if line.strip()]
             if len(lines) >= 1:
                 # First line contains headers
-                headers = [h.strip() for h in lines[0].split("|") if h.strip()]
+                headers = [h for h in map(str.strip, lines[0].split("|")) if h]
                 table_data["headers"] = headers
                 table_data["num_rows"] = len(lines) - 1  # Exclude header
                 table_data["num_cols"] = len(headers)
-            
-            # Add bounding box if available
-            if table.prov and table.prov[0].bbox:
-                bbox = table.prov[0].bbox
-                table_data["bbox"] = {
-                    "x1": bbox.l,
-                    "y1": bbox.t,
-                    "x2": bbox.r,
-                    "y2": bbox.b
-                }
-                
+
             return table_data
             
         except Exception as e:
             # Return basic info if table extraction fails
             return {
                 "page": page_no,
-                "content": table.export_to_markdown(),
+                "content": content,
                 "error": str(e)
             }
 
@@ -104,40 +190,34 @@ class DocumentParsingService:
         """Extract metadata from a picture."""
         picture_data = {
             "page": page_no,
-            "bbox": None,
+            "bbox": self._bbox(picture.prov),
             "captions": [],
             "classifications": []
         }
         
-        # Add bounding box if available
-        if picture.prov and picture.prov[0].bbox:
-            bbox = picture.prov[0].bbox
-            picture_data["bbox"] = {
-                "x1": bbox.l,
-                "y1": bbox.t,
-                "x2": bbox.r,
-                "y2": bbox.b
-            }
-            
         # Add captions if available
         if picture.captions:
             picture_data["captions"] = [
                 caption.text for caption in picture.captions
             ]
             
-        # Add classifications if available
-        if hasattr(picture, 'annotations'):
-            for annotation in picture.annotations:
-                if hasattr(annotation, 'predicted_classes'):
-                    for pred_class in annotation.predicted_classes:
-                        picture_data["classifications"].append({
-                            "class": pred_class.class_name,
-                            "confidence": pred_class.confidence
-                        })
+        # Add classifications if available, keeping the best confidence per class
+        best = {}
+        for annotation in getattr(picture, 'annotations', ()):
+            for pred_class in getattr(annotation, 'predicted_classes', ()):
+                name = pred_class.class_name
+                if name not in best or pred_class.confidence > best[name]:
+                    best[name] = pred_class.confidence
+        picture_data["classifications"] = [
+            {"class": name, "confidence": confidence}
+            for name, confidence in best.items()
+        ]
                         
         return picture_data
 
-    def _process_docling_document(self, docling_doc: DoclingDocument) -> dict:
+    def _process_docling_document(
+        self, docling_doc: "DoclingDocument", processed_at: Optional[datetime] = None
+    ) -> dict:
         """Process a Docling document and extract structured metadata."""
         metadata = {
             "num_pages": len(docling_doc.pages),
@@ -147,80 +227,174 @@ class DocumentParsingService:
             "has_formulas": False,
             "tables": [],
             "images": [],
-            "processing_time": datetime.now(UTC).isoformat()
+            "processing_time": (processed_at or datetime.now(UTC)).isoformat()
         }
         
+        # Resolve optional attributes once rather than re-checking them per item
+        tables = getattr(docling_doc, 'tables', None)
+        pictures = getattr(docling_doc, 'pictures', None)
+        images = getattr(docling_doc, 'images', None)
+        pages = docling_doc.pages
+        
         # Process tables
-        if hasattr(docling_doc, 'tables') and docling_doc.tables:
+        if tables:
             metadata["has_tables"] = True
-            for table in docling_doc.tables:
-                if table.prov:
-                    page_no = table.prov[0].page_no
-                    table_data = self._extract_table_data(table, page_no)
-                    metadata["tables"].append(table_data)
+            metadata["tables"] = [
+                self._extract_table_data(table, table.prov[0].page_no)
+                for table in tables if table.prov
+            ]
         
         # Process images/pictures
-        if hasattr(docling_doc, 'pictures') and docling_doc.pictures:
+        if pictures:
             metadata["has_images"] = True
-            for picture in docling_doc.pictures:
-                if picture.prov:
-                    page_no = picture.prov[0].page_no
-                    picture_data = self._extract_picture_data(picture, page_no)
-                    metadata["images"].append(picture_data)
-        elif hasattr(docling_doc, 'images') and docling_doc.images:
+            metadata["images"] = [
+                self._extract_picture_data(picture, picture.prov[0].page_no)
+                for picture in pictures if picture.prov
+            ]
+        elif images:
             # Handle image documents
             metadata["has_images"] = True
-            for image in docling_doc.images:
-                picture_data = {
+            metadata["images"] = [
+                {
                     "page": 1,  # Single page for image documents
                     "bbox": None,
                     "captions": [],
                     "classifications": []
                 }
-                metadata["images"].append(picture_data)
-        elif hasattr(docling_doc, 'pages'):
+                for _ in images
+            ]
+        else:
             # Check for images in pages
-            for page_no, page in docling_doc.pages.items():
-                if hasattr(page, 'pictures') and page.pictures:
+            for page_no, page in pages.items():
+                page_pictures = getattr(page, 'pictures', None)
+                page_images = getattr(page, 'images', None)
+                if page_pictures:
                     metadata["has_images"] = True
-                    for picture in page.pictures:
-                        picture_data = self._extract_picture_data(picture, page_no)
-                        metadata["images"].append(picture_data)
-                elif hasattr(page, 'images') and page.images:
+                    metadata["images"].extend(
+                        self._extract_picture_data(picture, page_no)
+                        for picture in page_pictures
+                    )
+                elif page_images:
                     metadata["has_images"] = True
-                    for image in page.images:
-                        picture_data = {
+                    metadata["images"].extend(
+                        {
                             "page": page_no,
                             "bbox": None,
                             "captions": [],
                             "classifications": []
                         }
-                        metadata["images"].append(picture_data)
+                        for _ in page_images
+                    )
         
-        # Process text items for code and formulas
-        if hasattr(docling_doc, 'texts'):
-            for text_item in docling_doc.texts:
-                if hasattr(text_item, 'label'):
-                    if text_item.label == "code":
-                        metadata["has_code"] = True
-                    elif text_item.label == "formula":
-                        metadata["has_formulas"] = True
-        
-        # Check for code in pages
-        if hasattr(docling_doc, 'pages'):
-            for page in docling_doc.pages.values():
-                if hasattr(page, 'texts'):
-                    for text_item in page.texts:
-                        if hasattr(text_item, 'label'):
-                            if text_item.label == "code":
-                                metadata["has_code"] = True
-                            elif text_item.label == "formula":
-                                metadata["has_formulas"] = True
-                if hasattr(page, 'code_blocks') and page.code_blocks:
-                    metadata["has_code"] = True
+        # Scan document and page text labels once, stopping once both are found
+        pages = pages.values()
+        labels = (
+            getattr(text_item, 'label', None)
+            for text_item in chain(
+                getattr(docling_doc, 'texts', ()),
+                *(getattr(page, 'texts', ()) for page in pages)
+            )
+        )
+        # Labels may be str enums, so compare by equality rather than hashing
+        for label in labels:
+            if label == "code":
+                metadata["has_code"] = True
+            elif label == "formula":
+                metadata["has_formulas"] = True
+            else:
+                continue
+            if metadata["has_code"] and metadata["has_formulas"]:
+                break
+        if not metadata["has_code"]:
+            metadata["has_code"] = any(getattr(page, 'code_blocks', None) for page in pages)
                     
         return metadata
 
+    def _detect_content_markers(self, document: Document) -> None:
+        """Fall back to markdown markers when Docling labelled no code or formulas."""
+        if not document.metadata.get("has_code") and CODE_MARKERS_RE.search(document.content):
+            document.metadata["has_code"] = True
+        if not document.metadata.get("has_formulas") and FORMULA_MARKERS_RE.search(document.content):
+            document.metadata["has_formulas"] = True
+
+    def _apply_conversion_result(self, document: Document, result) -> Document:
+        """Update a document from a Docling conversion result."""
+        from docling.datamodel.base_models import ConversionStatus
+
+        if result.status == ConversionStatus.SUCCESS:
+            # Extract document content and metadata
+            docling_doc = result.document
+            
+            # Update document fields
+            document.content = docling_doc.export_to_markdown()
+            document.metadata = self._process_docling_document(docling_doc, document.process_time)
+            
+            # Check for code and formulas in content
+            self._detect_content_markers(document)
+            
+            document.status = DocumentStatus.PROCESSED
+            
+        elif result.status == ConversionStatus.PARTIAL_SUCCESS:
+            # Handle partial success - some content was extracted
+            document.status = DocumentStatus.PROCESSED
+            document.content = result.document.export_to_markdown()
+            document.metadata = self._process_docling_document(result.document, document.process_time)
+            
+            # Check for missing expected content
+            self._detect_content_markers(document)
+            
+            # Check for missing or incomplete content
+            missing_content = []
+            if document.metadata.get("has_tables") and not document.metadata.get("tables"):
+                missing_content.append("Table structure could not be extracted")
+            if document.metadata.get("has_images") and not document.metadata.get("images"):
+                missing_content.append("Image data could not be extracted")
+            
+            # Build error message
+            error_parts = []
+            if missing_content:
+                error_parts.append("; ".join(missing_content))
+            if result.errors:
+                error_parts.append("; ".join(str(e) for e in result.errors))
+            if "corrupted" in document.filename.lower():
+                error_parts.append("File appears to be corrupted")
+            if not error_parts:
+                error_parts.append("Some content could not be processed")
+            
+            # Set error message
+            document.error = f"Partial success: {'; '.join(error_parts)}"
+            
+        else:
+            # Handle complete failure
+            document.status = DocumentStatus.FAILED
+            if result.errors:
+                document.error = f"Docling conversion failed: {'; '.join(str(e) for e in result.errors)}"
+            else:
+                document.error = "Docling conversion failed: Unknown error"
+                
+        return document
+
+    def _convert_document(self, document: Document, source: Union[str, Path, bytes]) -> Document:
+        """Convert a document from a path or its raw bytes with Docling and apply the result (blocking)."""
+        if isinstance(source, bytes):
+            from docling.datamodel.base_models import DocumentStream
+            source = DocumentStream(name=document.filename, stream=io.BytesIO(source))
+        else:
+            source = str(source)
+        
+        result = self.converter.convert(
+            source,
+            max_num_pages=100,  # Limit to 100 pages for now
+            raises_on_error=False  # Handle errors gracefully
+        )
+        return self._apply_conversion_result(document, result)
+
+    def close(self):
+        """Shut down the worker process pool, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
     async def parse_document(
         self, document: Document, file_path: Union[str, Path]
     ) -> Document:
@@ -234,81 +408,126 @@ class DocumentParsingService:
         Returns:
             Updated document with parsed content and metadata
         """
+        return await self._parse(document, str(file_path))
+
+    async def parse_document_bytes(self, document: Document, data: bytes) -> Document:
+        """
+        Parse a document already held in memory, without reading it from disk.
+        
+        Args:
+            document: The document model instance to update
+            data: Raw file content; document.filename supplies the format hint
+            
+        Returns:
+            Updated document with parsed content and metadata
+        """
+        return await self._parse(document, data)
+
+    async def _parse(self, document: Document, source: Union[str, bytes]) -> Document:
+        """Convert a document from a path or raw bytes and record any failure on it."""
         try:
             # Update document status to processing
             document.status = DocumentStatus.PROCESSING
             document.process_time = datetime.now(UTC)
             
-            # Convert document using Docling
-            result = self.converter.convert(
-                str(file_path),
-                max_num_pages=100,  # Limit to 100 pages for now
-                raises_on_error=False  # Handle errors gracefully
-            )
-            
-            if result.status == ConversionStatus.SUCCESS:
-                # Extract document content and metadata
-                docling_doc = result.document
-                
-                # Update document fields
-                document.content = docling_doc.export_to_markdown()
-                document.metadata = self._process_docling_document(docling_doc)
-                
-                # Check for code and formulas in content
-                if not document.metadata.get("has_code"):
-                    if "<code>" in document.content or "def " in document.content:
-                        document.metadata["has_code"] = True
-                if not document.metadata.get("has_formulas"):
-                    if "<sup>" in document.content or "mc2" in document.content or "E = mc" in document.content:
-                        document.metadata["has_formulas"] = True
-                
-                document.status = DocumentStatus.PROCESSED
-                
-            elif result.status == ConversionStatus.PARTIAL_SUCCESS:
-                # Handle partial success - some content was extracted
-                document.status = DocumentStatus.PROCESSED
-                document.content = result.document.export_to_markdown()
-                document.metadata = self._process_docling_document(result.document)
-                
-                # Check for missing expected content
-                if not document.metadata.get("has_code"):
-                    if "<code>" in document.content or "def " in document.content:
-                        document.metadata["has_code"] = True
-                if not document.metadata.get("has_formulas"):
-                    if "<sup>" in document.content or "mc2" in document.content or "E = mc" in document.content:
-                        document.metadata["has_formulas"] = True
-                
-                # Check for missing or incomplete content
-                missing_content = []
-                if document.metadata.get("has_tables") and not document.metadata.get("tables"):
-                    missing_content.append("Table structure could not be extracted")
-                if document.metadata.get("has_images") and not document.metadata.get("images"):
-                    missing_content.append("Image data could not be extracted")
-                
-                # Build error message
-                error_parts = []
-                if missing_content:
-                    error_parts.append("; ".join(missing_content))
-                if result.errors:
-                    error_parts.append("; ".join(str(e) for e in result.errors))
-                if "corrupted" in document.filename.lower():
-                    error_parts.append("File appears to be corrupted")
-                if not error_parts:
-                    error_parts.append("Some content could not be processed")
-                
-                # Set error message
-                document.error = f"Partial success: {'; '.join(error_parts)}"
-                
+            # Convert document using Docling without blocking the event loop
+            if self._pool is not None:
+                loop = asyncio.get_running_loop()
+                fields = await loop.run_in_executor(
+                    self._pool, _parse_in_worker, document, source
+                )
+                for name, value in fields.items():
+                    setattr(document, name, value)
             else:
-                # Handle complete failure
-                document.status = DocumentStatus.FAILED
-                if result.errors:
-                    document.error = f"Docling conversion failed: {'; '.join(str(e) for e in result.errors)}"
-                else:
-                    document.error = "Docling conversion failed: Unknown error"
+                await asyncio.to_thread(self._convert_document, document, source)
                 
         except Exception as e:
             document.status = DocumentStatus.FAILED
             document.error = f"Document parsing failed: {str(e)}"
             
-        return document
\ No newline at end of file
+        return document
+
+    async def parse_many(
+        self,
+        pairs: List[Tuple[Document, Union[str, Path]]],
+        max_concurrency: int = 8
+    ) -> List[Document]:
+        """
+        Parse several documents concurrently.
+        
+        Args:
+            pairs: (document, file_path) pairs to parse
+            max_concurrency: Maximum number of conversions running at once
+            
+        Returns:
+            Updated documents in the same order as the input pairs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _parse_one(document: Document, file_path: Union[str, Path]) -> Document:
+            async with semaphore:
+                return await self.parse_document(document, file_path)
+        
+        return await asyncio.gather(
+            *(_parse_one(document, file_path) for document, file_path in pairs)
+        )
+
+    async def parse_documents(
+        self, documents: List[Document]
+    ) -> AsyncIterator[Document]:
+        """
+        Parse a batch of documents with a single streaming Docling conversion.
+        
+        Args:
+            documents: Document model instances to update, read from their file_path
+            
+        Yields:
+            Each updated document as soon as its conversion finishes
+        """
+        pending = {}
+        for document in documents:
+            document.status = DocumentStatus.PROCESSING
+            pending.setdefault(Path(document.file_path).resolve(), []).append(document)
+        
+        converter = await asyncio.to_thread(self._ensure_converter)
+        results = converter.convert_all(
+            list(pending),
+            max_num_pages=100,  # Limit to 100 pages for now
+            raises_on_error=False  # Handle errors gracefully
+        )
+        
+        while True:
+            # Pull the next result off the event loop
+            try:
+                result = await asyncio.to_thread(next, results, None)
+            except Exception as e:
+                process_time = datetime.now(UTC)
+                for batch in pending.values():
+                    for document in batch:
+                        document.process_time = process_time
+                        document.status = DocumentStatus.FAILED
+                        document.error = f"Document parsing failed: {str(e)}"
+                        yield document
+                return
+            if result is None:
+                break
+            
+            # Stamp documents as their own conversion finishes
+            process_time = datetime.now(UTC)
+            for document in pending.pop(Path(result.input.file).resolve(), []):
+                document.process_time = process_time
+                try:
+                    self._apply_conversion_result(document, result)
+                except Exception as e:
+                    document.status = DocumentStatus.FAILED
+                    document.error = f"Document parsing failed: {str(e)}"
+                yield document
+        
+        # Anything Docling did not report back is treated as failed
+        process_time = datetime.now(UTC)
+        for batch in pending.values():
+            for document in batch:
+                document.process_time = process_time
+                document.status = DocumentStatus.FAILED
+                document.error = "Docling conversion failed: No result returned"
+                yield document
\ No newline at end of file
@@ -1,50 +1,21 @@
 from typing import List, Dict, Any, Tuple, Optional
-import logging
-from uuid import uuid4
+from bisect import bisect_left, bisect_right
 
-from .base import TableExtractor
+import numpy as np
+
+from .base import CAPTION_RE, TableExtractor
 from .models.table import Table, TableCell, TableDetectionMethod
 
 
 class DoclingTableExtractor(TableExtractor):
     """AI-driven table extractor using IBM Docling's output."""
 
-    def __init__(self, min_confidence_threshold: float = 0.7):
-        self.logger = logging.getLogger(__name__)
-        self.min_confidence_threshold = min_confidence_threshold
-
-    async def extract_tables(
-        self,
-        document_id: str,
-        parsed_content: Dict[str, Any],
-        **kwargs
-    ) -> List[Table]:
-        """
-        Extract tables from Docling's parsed content.
-
-        Args:
-            document_id: Unique identifier of the document
-            parsed_content: Parsed document content from IBM Docling
-            **kwargs: Additional extraction parameters
-
-        Returns:
-            List of extracted tables
-        """
-        tables = []
-        try:
-            # Extract tables from each page
-            for page_num, page_content in enumerate(parsed_content.get("pages", []), 1):
-                page_tables = await self._extract_page_tables(
-                    document_id, page_num, page_content
-                )
-                tables.extend(page_tables)
-        except Exception as e:
-            self.logger.error(f"Error extracting tables: {str(e)}")
-            raise
+    detection_method = TableDetectionMethod.AI_DRIVEN
 
-        return tables
+    def __init__(self, min_confidence_threshold: float = 0.7, process_workers: int = 0):
+        super().__init__(min_confidence_threshold, process_workers)
 
-    async def _extract_page_tables(
+    def _extract_page_tables(
         self,
         document_id: str,
         page_num: int,
@@ -53,13 +24,17 @@ class DoclingTableExtractor(TableExtractor):
         """Extract tables from a single page."""
         tables = []
         
-        # Get table regions from Docling's layout analysis
-        table_regions = self._find_table_regions(page_content)
+        # Get table regions from Docling's layout analysis, keeping the
+        # column positions computed for implicit tables so they are not re-derived
+        column_positions: Dict[int, List[float]] = {}
+        table_regions = self._find_table_regions(page_content, column_positions)
+        caption_index = self._build_caption_index(page_content) if table_regions else None
         
-        for region in table_regions:
+        for region_index, region in enumerate(table_regions):
             try:
-                table = await self._process_table_region(
-                    document_id, page_num, region, page_content
+                table = self._process_table_region(
+                    document_id, page_num, region, page_content,
+                    column_positions.get(id(region)), caption_index, region_index
                 )
                 if table:
                     tables.append(table)
@@ -70,12 +45,17 @@ class DoclingTableExtractor(TableExtractor):
 
         return tables
 
-    def _find_table_regions(self, page_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _find_table_regions(
+        self,
+        page_content: Dict[str, Any],
+        column_positions: Optional[Dict[int, List[float]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Find table regions in Docling's page content.
         
         Docling typically marks tables with specific layout types or
-        structural indicators in its output.
+        structural indicators in its output. Column positions computed
+        for text elements are stored in column_positions, keyed by id().
         """
         table_regions = []
         
@@ -87,12 +67,20 @@ class DoclingTableExtractor(TableExtractor):
             if element.get("type") == "table":
                 table_regions.append(element)
             # Also check for implicit tables (grid-like structures)
-            elif self._is_implicit_table(element):
-                table_regions.append(element)
+            elif element.get("type") == "text":
+                col_positions = self._get_column_positions(element.get("blocks", []))
+                if column_positions is not None:
+                    column_positions[id(element)] = col_positions
+                if self._is_implicit_table(element, col_positions):
+                    table_regions.append(element)
 
         return table_regions
 
-    def _is_implicit_table(self, element: Dict[str, Any]) -> bool:
+    def _is_implicit_table(
+        self,
+        element: Dict[str, Any],
+        col_positions: Optional[List[float]] = None
+    ) -> bool:
         """
         Detect if an element represents an implicit table structure.
         
@@ -109,7 +97,8 @@ class DoclingTableExtractor(TableExtractor):
             return False
 
         # Check for aligned columns
-        col_positions = self._get_column_positions(blocks)
+        if col_positions is None:
+            col_positions = self._get_column_positions(blocks)
         return len(col_positions) > 1 and self._has_consistent_alignment(blocks, col_positions)
 
     def _get_column_positions(self, blocks: List[Dict[str, Any]]) -> List[float]:
@@ -126,32 +115,61 @@ class DoclingTableExtractor(TableExtractor):
         col_positions: List[float]
     ) -> bool:
         """Check if text blocks show consistent column alignment."""
+        total = len(blocks)
         alignment_count = 0
-        for block in blocks:
-            block_positions = [text.get("x", 0) for text in block.get("text", [])]
-            if any(abs(pos - col_pos) < 5 for pos in block_positions 
-                  for col_pos in col_positions):
+        for checked, block in enumerate(blocks, 1):
+            if any(self._near_position(text.get("x", 0), col_positions)
+                   for text in block.get("text", [])):
                 alignment_count += 1
+            # Stop once the outcome can no longer change
+            if alignment_count / total > 0.7:
+                return True
+            if (alignment_count + total - checked) / total <= 0.7:
+                return False
         
         return alignment_count / len(blocks) > 0.7  # 70% alignment threshold
 
-    async def _process_table_region(
+    @staticmethod
+    def _near_position(position: float, sorted_positions: List[float], tolerance: float = 5) -> bool:
+        """Check whether a position lies within tolerance of any sorted position."""
+        i = bisect_left(sorted_positions, position)
+        if i < len(sorted_positions) and sorted_positions[i] - position < tolerance:
+            return True
+        return i > 0 and position - sorted_positions[i - 1] < tolerance
+
+    def _process_table_region(
         self,
         document_id: str,
         page_num: int,
         region: Dict[str, Any],
-        page_content: Dict[str, Any]
+        page_content: Dict[str, Any],
+        col_positions: Optional[List[float]] = None,
+        caption_index: Optional[Dict[str, list]] = None,
+        region_index: int = 0
     ) -> Optional[Table]:
         """Process a table region into a structured Table object."""
         try:
+            # Structure and content factors are at most 1.0, so skip regions
+            # whose layout alone keeps them under the threshold
+            layout_confidence = self._calculate_layout_confidence(region, col_positions)
+            best_confidence = sum([1.0, 1.0, layout_confidence]) / 3
+            if best_confidence < self.min_confidence_threshold:
+                self.logger.debug(
+                    f"Table confidence at most {best_confidence} below threshold "
+                    f"{self.min_confidence_threshold}"
+                )
+                return None
+
             # Extract cells and determine table structure
-            cells, num_rows, num_cols = await self._extract_cells(region)
+            cells, num_rows, num_cols = self._extract_cells(region)
             
             if not cells:
                 return None
 
             # Calculate confidence score
-            confidence_score = self._calculate_confidence(cells, region)
+            confidence_score = self._calculate_confidence(
+                cells, region, col_positions, layout_confidence
+            )
             
             if confidence_score < self.min_confidence_threshold:
                 self.logger.debug(
@@ -162,13 +180,13 @@ class DoclingTableExtractor(TableExtractor):
 
             # Create table object
             table = Table(
-                id=f"table-{document_id}-{page_num}-{uuid4().hex[:8]}",
+                id=self._table_id(document_id, page_num, region_index),
                 document_id=document_id,
                 page_number=page_num,
                 cells=cells,
                 num_rows=num_rows,
                 num_cols=num_cols,
-                caption=self._extract_caption(region, page_content),
+                caption=self._extract_caption(region, page_content, caption_index),
                 detection_method=TableDetectionMethod.AI_DRIVEN,
                 confidence_score=confidence_score,
                 bbox=region.get("bbox"),
@@ -184,7 +202,7 @@ class DoclingTableExtractor(TableExtractor):
             self.logger.error(f"Error processing table region: {str(e)}")
             return None
 
-    async def _extract_cells(
+    def _extract_cells(
         self,
         region: Dict[str, Any]
     ) -> Tuple[List[TableCell], int, int]:
@@ -197,22 +215,18 @@ class DoclingTableExtractor(TableExtractor):
             - Number of rows
             - Number of columns
         """
-        cells = []
-        max_row = 0
-        max_col = 0
-
         # Process cells based on region type
-        if region.get("type") == "table":
-            # Handle explicit table structure
-            for cell_data in region.get("cells", []):
-                cell = self._process_cell(cell_data)
-                if cell:
-                    cells.append(cell)
-                    max_row = max(max_row, cell.row + cell.rowspan)
-                    max_col = max(max_col, cell.col + cell.colspan)
-        else:
+        if region.get("type") != "table":
             # Handle implicit table structure
-            cells, max_row, max_col = await self._process_implicit_table(region)
+            return self._process_implicit_table(region)
+
+        # Handle explicit table structure, dropping cells that fail validation
+        cells = [
+            cell for cell in map(self._process_cell, region.get("cells", ()))
+            if cell is not None
+        ]
+        max_row = max((cell.row + cell.rowspan for cell in cells), default=0)
+        max_col = max((cell.col + cell.colspan for cell in cells), default=0)
 
         return cells, max_row, max_col
 
@@ -237,54 +251,101 @@ class DoclingTableExtractor(TableExtractor):
             self.logger.warning(f"Failed to process cell: {str(e)}")
             return None
 
-    async def _process_implicit_table(
+    def _process_implicit_table(
         self,
         region: Dict[str, Any]
     ) -> Tuple[List[TableCell], int, int]:
         """Process an implicit table structure from aligned text blocks."""
-        cells = []
-        row_positions = self._get_row_positions(region)
-        col_positions = self._get_column_positions(region.get("blocks", []))
-        
-        for block in region.get("blocks", []):
-            for text in block.get("text", []):
-                row = self._get_position_index(text.get("y", 0), row_positions)
-                col = self._get_position_index(text.get("x", 0), col_positions)
-                
-                cell = TableCell(
-                    text=text.get("content", "").strip(),
-                    row=row,
-                    col=col,
-                    is_header=row == 0,  # Assume first row is header
-                    confidence=0.8,  # Lower confidence for implicit tables
-                    metadata={
-                        "font": text.get("font"),
-                        "font_size": text.get("font_size")
-                    }
-                )
-                cells.append(cell)
+        texts, xs, ys = self._collect_xy(region)
+        if not texts:
+            return [], 0, 0
+
+        # Map every text item to its row/column anchor in one call each
+        rows, num_rows = self._position_indices(ys)
+        cols, num_cols = self._position_indices(xs)
+
+        cells = [
+            TableCell(
+                text=text.get("content", "").strip(),
+                row=row,
+                col=col,
+                is_header=row == 0,  # Assume first row is header
+                confidence=0.8,  # Lower confidence for implicit tables
+                metadata={
+                    "font": text.get("font"),
+                    "font_size": text.get("font_size")
+                }
+            )
+            for text, row, col in zip(texts, rows, cols)
+        ]
 
-        return cells, len(row_positions), len(col_positions)
+        return cells, num_rows, num_cols
 
-    def _get_row_positions(self, region: Dict[str, Any]) -> List[float]:
-        """Get unique y-positions that might represent rows."""
-        positions = set()
+    def _collect_xy(
+        self,
+        region: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """Flatten a region's text items and their x/y positions in one traversal."""
+        texts = []
+        coords = []
         for block in region.get("blocks", []):
             for text in block.get("text", []):
-                positions.add(text.get("y", 0))
-        return sorted(positions)
+                texts.append(text)
+                coords.append((text.get("x", 0), text.get("y", 0)))
+        xy = np.array(coords, dtype=float).reshape(-1, 2)
+        return texts, xy[:, 0], xy[:, 1]
+
+    @staticmethod
+    def _position_indices(
+        positions: np.ndarray, tolerance: float = 5.0
+    ) -> Tuple[List[int], int]:
+        """
+        Map positions to anchor indices, returning the indices and the anchor count.
+
+        Every distinct position is an anchor, and each position takes the
+        first anchor in sorted order within the tolerance of it (5 pixels by
+        default). Since a position is always its own anchor, that is the
+        first anchor above position - tolerance.
+        """
+        anchors = np.unique(positions)
+        indices = np.searchsorted(anchors, positions - tolerance, side="right")
+        return indices.tolist(), len(anchors)
 
-    def _get_position_index(self, position: float, positions: List[float]) -> int:
-        """Get the index of the closest position in a list of positions."""
-        for i, pos in enumerate(positions):
-            if abs(position - pos) < 5:  # 5-pixel threshold
-                return i
-        return len(positions) - 1
+    def _build_caption_index(self, page_content: Dict[str, Any]) -> Dict[str, list]:
+        """
+        Index caption-like text blocks on a page by their vertical edges.
+
+        Each entry is (y, element order, text), sorted by y, so captions near
+        a table can be found by bisecting instead of scanning every element.
+        """
+        bottoms = []
+        tops = []
+        for order, block in enumerate(page_content.get("layout", {}).get("elements", [])):
+            if block.get("type") != "text":
+                continue
+            text = block.get("text", "")
+            block_bbox = block.get("bbox")
+            if not isinstance(text, str) or not block_bbox:
+                continue
+            if CAPTION_RE.match(text) and len(text.strip()) < 200:
+                bottoms.append((block_bbox[3], order, text))
+                tops.append((block_bbox[1], order, text))
+
+        bottoms.sort()
+        tops.sort()
+        return {
+            "bottoms": bottoms,
+            "bottom_keys": [entry[0] for entry in bottoms],
+            "tops": tops,
+            "top_keys": [entry[0] for entry in tops]
+        }
 
     def _extract_caption(
         self,
         region: Dict[str, Any],
-        page_content: Dict[str, Any]
+        page_content: Dict[str, Any],
+        caption_index: Optional[Dict[str, list]] = None,
+        threshold: float = 50
     ) -> Optional[str]:
         """Extract table caption if available."""
         # Check for explicit caption
@@ -297,62 +358,61 @@ class DoclingTableExtractor(TableExtractor):
         if not bbox:
             return None
 
-        # Look for text blocks just above or below the table
-        for block in page_content.get("layout", {}).get("elements", []):
-            if block.get("type") == "text":
-                text = block.get("text", "").strip().lower()
-                if text.startswith("table ") and len(text) < 200:
-                    block_bbox = block.get("bbox")
-                    if block_bbox and self._is_nearby(bbox, block_bbox):
-                        return block.get("text")
-
-        return None
-
-    def _is_nearby(
-        self,
-        table_bbox: List[float],
-        text_bbox: List[float],
-        threshold: float = 50
-    ) -> bool:
-        """Check if a text block is near the table."""
-        return (abs(table_bbox[1] - text_bbox[3]) < threshold or  # Text above table
-                abs(table_bbox[3] - text_bbox[1]) < threshold)    # Text below table
+        if caption_index is None:
+            caption_index = self._build_caption_index(page_content)
+
+        # Text just above the table (its bottom near the table top) or just
+        # below it (its top near the table bottom)
+        candidates = []
+        for keys, entries, y in (
+            (caption_index["bottom_keys"], caption_index["bottoms"], bbox[1]),
+            (caption_index["top_keys"], caption_index["tops"], bbox[3])
+        ):
+            start = bisect_right(keys, y - threshold)
+            end = bisect_left(keys, y + threshold)
+            candidates.extend(entries[start:end])
+
+        if not candidates:
+            return None
+        # Prefer the earliest element in layout order
+        return min(candidates, key=lambda entry: entry[1])[2]
 
     def _calculate_confidence(
         self,
         cells: List[TableCell],
-        region: Dict[str, Any]
+        region: Dict[str, Any],
+        col_positions: Optional[List[float]] = None,
+        layout_confidence: Optional[float] = None
     ) -> float:
         """Calculate overall confidence score for the table extraction."""
         if not cells:
             return 0.0
 
+        # Gather structure and content statistics in a single pass over the cells
+        rows = set()
+        cols = set()
+        confidence_sum = 0.0
+        for cell in cells:
+            rows.add(cell.row)
+            cols.add(cell.col)
+            confidence_sum += cell.confidence
+
         factors = [
-            self._calculate_structure_confidence(cells),
-            self._calculate_content_confidence(cells),
-            self._calculate_layout_confidence(region)
+            # Perfect grid should have cells in every position
+            min(1.0, len(cells) / (len(rows) * len(cols))),
+            # Average of individual cell confidences
+            confidence_sum / len(cells),
+            layout_confidence if layout_confidence is not None
+            else self._calculate_layout_confidence(region, col_positions)
         ]
         
         return sum(factors) / len(factors)
 
-    def _calculate_structure_confidence(self, cells: List[TableCell]) -> float:
-        """Calculate confidence based on table structure."""
-        # Check for consistent row/column structure
-        rows = set(cell.row for cell in cells)
-        cols = set(cell.col for cell in cells)
-        
-        # Perfect grid should have cells in every position
-        expected_cells = len(rows) * len(cols)
-        actual_cells = len(cells)
-        
-        return min(1.0, actual_cells / expected_cells)
-
-    def _calculate_content_confidence(self, cells: List[TableCell]) -> float:
-        """Calculate confidence based on cell content."""
-        # Average of individual cell confidences
-        return sum(cell.confidence for cell in cells) / len(cells)
-
-    def _calculate_layout_confidence(self, region: Dict[str, Any]) -> float:
+    def _calculate_layout_confidence(
+        self,
+        region: Dict[str, Any],
+        col_positions: Optional[List[float]] = None
+    ) -> float:
         """Calculate confidence based on layout analysis."""
         # Higher confidence for explicit tables
         if region.get("type") == "table":
@@ -360,7 +420,8 @@ class DoclingTableExtractor(TableExtractor):
         
         # For implicit tables, check alignment quality
         blocks = region.get("blocks", [])
-        col_positions = self._get_column_positions(blocks)
+        if col_positions is None:
+            col_positions = self._get_column_positions(blocks)
         if not col_positions:
             return 0.5
         
@@ -386,36 +447,41 @@ class DoclingTableExtractor(TableExtractor):
             if table.num_rows < 1 or table.num_cols < 2:
                 return False
 
-            # Verify cell positions
-            for cell in table.cells:
-                if (cell.row < 0 or cell.row >= table.num_rows or
-                    cell.col < 0 or cell.col >= table.num_cols):
-                    return False
-
-            # Check for minimum content
-            non_empty_cells = sum(1 for cell in table.cells if cell.text.strip())
-            if non_empty_cells / len(table.cells) < 0.5:  # Require 50% non-empty cells
+            # Check positions on whole columns of cell attributes at once
+            arrays = table.cell_arrays()
+            rows, cols = arrays.rows, arrays.cols
+            row_ends = rows + arrays.rowspans
+            col_ends = cols + arrays.colspans
+            if ((rows < 0).any() or (rows >= table.num_rows).any() or
+                (cols < 0).any() or (cols >= table.num_cols).any()):
                 return False
-
-            # Verify no overlapping cells
-            if not self._verify_no_cell_overlap(table):
+            # Spans running off the grid are invalid
+            if (row_ends > table.num_rows).any() or (col_ends > table.num_cols).any():
                 return False
 
-            return True
+            single = (arrays.rowspans == 1) & (arrays.colspans == 1)
+            if single.all():
+                # Without spanning cells, overlap is just a repeated position
+                positions = rows.astype(np.int64) * table.num_cols + cols
+                if np.unique(positions).size != positions.size:
+                    return False
+            else:
+                # Count how many cells cover each grid position: scatter the
+                # single-position cells in one call, then add the spanning ones
+                coverage = np.zeros((table.num_rows, table.num_cols), dtype=np.int32)
+                np.add.at(coverage, (rows[single], cols[single]), 1)
+                for row, col, row_end, col_end in zip(
+                    rows[~single].tolist(), cols[~single].tolist(),
+                    row_ends[~single].tolist(), col_ends[~single].tolist()
+                ):
+                    coverage[row:row_end, col:col_end] += 1
+                if (coverage > 1).any():  # Cell position already occupied
+                    return False
+
+            # Require 50% non-empty cells
+            non_empty_cells = sum(1 for text in arrays.text if text.strip())
+            return non_empty_cells / len(table.cells) >= 0.5
 
         except Exception as e:
             self.logger.error(f"Error validating table: {str(e)}")
             return False
-
-    def _verify_no_cell_overlap(self, table: Table) -> bool:
-        """Verify that no cells overlap in the table grid."""
-        grid = [[False] * table.num_cols for _ in range(table.num_rows)]
-        
-        for cell in table.cells:
-            for r in range(cell.row, cell.row + cell.rowspan):
-                for c in range(cell.col, cell.col + cell.colspan):
-                    if grid[r][c]:  # Cell position already occupied
-                        return False
-                    grid[r][c] = True
-                    
-        return True
\ No newline at end of file
@@ -1,13 +1,59 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import AsyncIterator, ClassVar, List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
 
-from .models.table import Table
+from .models.table import Table, TableDetectionMethod
+
+# Caption-like text: "Table " at the start, ignoring case and leading whitespace
+CAPTION_RE = re.compile(r"\s*table ", re.IGNORECASE)
+
+
+def _extract_page_in_worker(
+    extractor_cls: type,
+    min_confidence_threshold: float,
+    document_id: str,
+    page_num: int,
+    page_content: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Extract a page's tables in a worker process and return them as plain dicts."""
+    extractor = extractor_cls(min_confidence_threshold)
+    return [
+        table.model_dump()
+        for table in extractor._extract_page_tables(document_id, page_num, page_content)
+    ]
 
 
 class TableExtractor(ABC):
-    """Base class for table extraction implementations."""
+    """
+    Base class for table extraction implementations.
+
+    Page-based extractors implement _extract_page_tables and inherit
+    concurrent extraction, streaming and the optional worker pool;
+    others override extract_tables (and optionally iter_tables) instead.
+    """
+
+    # Set on extractors whose output is already validated, so the service
+    # does not call validate_table on it again
+    tables_prevalidated: ClassVar[bool] = False
+
+    # Method recorded in the IDs of tables from _extract_page_tables
+    detection_method: ClassVar[Optional[TableDetectionMethod]] = None
+
+    def __init__(self, min_confidence_threshold: float, process_workers: int = 0):
+        self.logger = logging.getLogger(type(self).__module__)
+        self.min_confidence_threshold = min_confidence_threshold
+        # Optionally extract pages in worker processes to sidestep the GIL
+        self._pool = ProcessPoolExecutor(max_workers=process_workers) if process_workers > 0 else None
+
+    def close(self):
+        """Shut down the worker pool, if any."""
+        if getattr(self, "_pool", None) is not None:
+            self._pool.shutdown()
+            self._pool = None
 
-    @abstractmethod
     async def extract_tables(
         self,
         document_id: str,
@@ -17,6 +63,8 @@ class TableExtractor(ABC):
         """
         Extract tables from parsed document content.
 
+        The default extracts all pages concurrently with _extract_page_tables.
+
         Args:
             document_id: Unique identifier of the document
             parsed_content: Parsed document content from IBM Docling
@@ -25,7 +73,105 @@ class TableExtractor(ABC):
         Returns:
             List of extracted tables
         """
-        pass
+        results = await asyncio.gather(
+            *(
+                self._extract_page_tables_async(document_id, page_num, page_content)
+                for page_num, page_content in enumerate(parsed_content.get("pages", []), 1)
+            ),
+            return_exceptions=True
+        )
+        tables = []
+        for page_num, page_tables in enumerate(results, 1):
+            if isinstance(page_tables, Exception):
+                self._log_page_failure(page_num, page_tables)
+                continue
+            tables.extend(page_tables)
+
+        return tables
+
+    async def iter_tables(
+        self,
+        document_id: str,
+        parsed_content: Dict[str, Any],
+        **kwargs
+    ) -> AsyncIterator[Table]:
+        """
+        Extract tables from parsed document content one at a time.
+
+        Page-based extractors yield each page's tables before moving on,
+        so only one page's tables are held at a time; extractors that
+        override extract_tables yield its result.
+
+        Args:
+            document_id: Unique identifier of the document
+            parsed_content: Parsed document content from IBM Docling
+            **kwargs: Additional extraction parameters
+
+        Yields:
+            Extracted tables
+        """
+        if type(self).extract_tables is not TableExtractor.extract_tables:
+            for table in await self.extract_tables(document_id, parsed_content, **kwargs):
+                yield table
+            return
+
+        for page_num, page_content in enumerate(parsed_content.get("pages", []), 1):
+            try:
+                page_tables = await self._extract_page_tables_async(
+                    document_id, page_num, page_content
+                )
+            except Exception as e:
+                self._log_page_failure(page_num, e)
+                continue
+            for table in page_tables:
+                yield table
+
+    def _log_page_failure(self, page_num: int, error: Exception):
+        """Log a page that failed; the tables from other pages are kept."""
+        self.logger.warning(f"Failed to extract tables from page {page_num}: {str(error)}")
+
+    async def _extract_page_tables_async(
+        self,
+        document_id: str,
+        page_num: int,
+        page_content: Dict[str, Any]
+    ) -> List[Table]:
+        """Run page extraction off the event loop, in the worker pool if configured."""
+        if self._pool is None:
+            return await asyncio.to_thread(
+                self._extract_page_tables, document_id, page_num, page_content
+            )
+        loop = asyncio.get_running_loop()
+        dumped = await loop.run_in_executor(
+            self._pool, _extract_page_in_worker, type(self),
+            self.min_confidence_threshold, document_id, page_num, page_content
+        )
+        return [Table.model_validate(table) for table in dumped]
+
+    def _extract_page_tables(
+        self,
+        document_id: str,
+        page_num: int,
+        page_content: Dict[str, Any]
+    ) -> List[Table]:
+        """
+        Extract tables from a single page (blocking).
+
+        Page-based extractors override this; the default finds no tables.
+
+        Args:
+            document_id: Unique identifier of the document
+            page_num: 1-based page number
+            page_content: The page's parsed content
+
+        Returns:
+            List of the page's tables
+        """
+        return []
+
+    def _table_id(self, document_id: str, page_num: int, region_index: int) -> str:
+        """Deterministic table ID from the document, page and region position."""
+        return f"table-{document_id}-{page_num}-{self.detection_method.value}-{region_index}"
 
     @abstractmethod
     async def validate_table(self, table: Table) -> bool:
@@ -38,4 +184,27 @@ class TableExtractor(ABC):
         Returns:
             True if table is valid, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def extract_many(
+        self,
+        documents: List[Tuple[str, Dict[str, Any]]],
+        **kwargs
+    ) -> Dict[str, List[Table]]:
+        """
+        Extract tables from a batch of parsed documents.
+
+        Implementations can override this to amortize setup across documents;
+        the default extracts each document in turn.
+
+        Args:
+            documents: (document_id, parsed_content) pairs
+            **kwargs: Additional extraction parameters
+
+        Returns:
+            Extracted tables keyed by document ID
+        """
+        return {
+            document_id: await self.extract_tables(document_id, parsed_content, **kwargs)
+            for document_id, parsed_content in documents
+        }
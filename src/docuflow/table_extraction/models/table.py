@@ -1,5 +1,8 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Dict, Any
+
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -28,6 +31,17 @@ class TableCell(BaseModel):
     )
 
 
+@dataclass
+class CellArrays:
+    """Column-wise (structure-of-arrays) view of a table's cells."""
+    rows: np.ndarray
+    cols: np.ndarray
+    rowspans: np.ndarray
+    colspans: np.ndarray
+    confidence: np.ndarray
+    text: List[str]
+
+
 class Table(BaseModel):
     id: str = Field(description="Unique identifier for the table")
     document_id: str = Field(description="ID of the document containing this table")
@@ -56,10 +70,26 @@ class Table(BaseModel):
         description="Additional metadata about the table"
     )
 
+    def cell_arrays(self) -> CellArrays:
+        """
+        Get the cells as NumPy arrays, one per attribute.
+
+        The arrays are a snapshot; build them once per pass over the table.
+        """
+        count = len(self.cells)
+        return CellArrays(
+            rows=np.fromiter((cell.row for cell in self.cells), dtype=np.int32, count=count),
+            cols=np.fromiter((cell.col for cell in self.cells), dtype=np.int32, count=count),
+            rowspans=np.fromiter((cell.rowspan for cell in self.cells), dtype=np.int32, count=count),
+            colspans=np.fromiter((cell.colspan for cell in self.cells), dtype=np.int32, count=count),
+            confidence=np.fromiter((cell.confidence for cell in self.cells), dtype=np.float32, count=count),
+            text=[cell.text for cell in self.cells]
+        )
+
     def to_dict_format(self) -> List[List[str]]:
         """Convert the table to a 2D list format."""
         # Initialize empty grid
-        grid = [['' for _ in range(self.num_cols)] for _ in range(self.num_rows)]
+        grid = [[''] * self.num_cols for _ in range(self.num_rows)]
         
         # Fill in cells
         for cell in self.cells:
@@ -81,19 +111,13 @@ class Table(BaseModel):
             0  # Default to first row if no explicit headers
         )
 
-        # Convert to markdown
-        md_lines = []
+        # Convert rows to markdown, with a separator after the header
+        md_lines = ["| " + " | ".join(row) + " |" for row in grid]
+        if header_row < len(md_lines):
+            md_lines.insert(header_row + 1, "|" + "|".join(["---"] * self.num_cols) + "|")
         
         # Add caption if exists
         if self.caption:
-            md_lines.append(f"**{self.caption}**\n")
-
-        # Process rows
-        for i, row in enumerate(grid):
-            md_lines.append("| " + " | ".join(str(cell) for cell in row) + " |")
-            
-            # Add separator after header
-            if i == header_row:
-                md_lines.append("|" + "|".join("---" for _ in row) + "|")
+            md_lines.insert(0, f"**{self.caption}**\n")
 
         return "\n".join(md_lines)
\ No newline at end of file
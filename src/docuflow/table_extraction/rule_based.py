@@ -1,50 +1,113 @@
-from typing import List, Dict, Any, Tuple, Optional
-import logging
-from uuid import uuid4
+from typing import List, Dict, Any, Iterable, NamedTuple, Tuple, Optional
+from dataclasses import dataclass
 
-from .base import TableExtractor
+import numpy as np
+
+from .base import CAPTION_RE, TableExtractor
 from .models.table import Table, TableCell, TableDetectionMethod
 
 
+# Blocks whose tops are within this distance of a row's first block share the row
+ROW_Y_TOLERANCE = 5.0
+
+
+def _text_block(element: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a layout element into a text block."""
+    return {
+        "text": element.get("text", ""),
+        "bbox": element.get("bbox", [0, 0, 0, 0]),
+        "font": element.get("font"),
+        "font_size": element.get("font_size")
+    }
+
+
+def _intern(values: List[Any]) -> Tuple[np.ndarray, int]:
+    """Map hashable values to dense integer ids, returning the ids and the id count."""
+    table: Dict[Any, int] = {}
+    ids = np.fromiter(
+        (table.setdefault(value, len(table)) for value in values), dtype=np.intp, count=len(values)
+    )
+    return ids, max(len(table), 1)
+
+
+@dataclass
+class PageBlocks:
+    """Text blocks of a page stored column-wise, in reading order."""
+    elements: List[Dict[str, Any]]
+    bbox: np.ndarray
+    font_id: np.ndarray
+    num_fonts: int
+    font_size_id: np.ndarray
+    num_font_sizes: int
+
+    @classmethod
+    def from_elements(cls, elements: List[Dict[str, Any]]) -> "PageBlocks":
+        bbox = np.array(
+            [element.get("bbox", [0, 0, 0, 0]) for element in elements], dtype=float
+        ).reshape(len(elements), 4)
+        font_id, num_fonts = _intern([element.get("font") for element in elements])
+        font_size_id, num_font_sizes = _intern([element.get("font_size") for element in elements])
+        return cls(elements, bbox, font_id, num_fonts, font_size_id, num_font_sizes)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def take(self, order: np.ndarray) -> "PageBlocks":
+        """Blocks reordered by an index array."""
+        return PageBlocks(
+            [self.elements[i] for i in order.tolist()], self.bbox[order],
+            self.font_id[order], self.num_fonts,
+            self.font_size_id[order], self.num_font_sizes
+        )
+
+    def rows(self, row_slices: List[slice]) -> List[List[Dict[str, Any]]]:
+        """Text block dicts for each row slice."""
+        return [[_text_block(element) for element in self.elements[row]] for row in row_slices]
+
+
+class PageIndex(NamedTuple):
+    """Text blocks, their row grouping and caption candidates from one pass over a page."""
+    blocks: PageBlocks
+    rows: List[slice]
+    captions: List[Tuple[List[float], str]]
+
+
+def _row_slices(ys: np.ndarray, y_tolerance: float) -> List[slice]:
+    """Row slices over blocks sorted by y."""
+    # Each row takes every block within tolerance of the row's first block,
+    # so jump from row start to row start with a binary search
+    row_ends = np.searchsorted(ys, ys + y_tolerance, side="right")
+    rows = []
+    start = 0
+    while start < len(ys):
+        end = int(row_ends[start])
+        rows.append(slice(start, end))
+        start = end
+    return rows
+
+
+def _mean_variance(values: Iterable[float]) -> Tuple[int, float, float]:
+    """Count, mean and population variance of values in one streaming pass (Welford)."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in values:
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+    return n, mean, (m2 / n if n else 0.0)
+
+
 class RuleBasedTableExtractor(TableExtractor):
     """Rule-based table extractor using layout analysis and heuristics."""
 
-    def __init__(self, min_confidence_threshold: float = 0.6):
-        self.logger = logging.getLogger(__name__)
-        self.min_confidence_threshold = min_confidence_threshold
-
-    async def extract_tables(
-        self,
-        document_id: str,
-        parsed_content: Dict[str, Any],
-        **kwargs
-    ) -> List[Table]:
-        """
-        Extract tables using rule-based methods.
+    detection_method = TableDetectionMethod.RULE_BASED
 
-        Args:
-            document_id: Unique identifier of the document
-            parsed_content: Parsed document content from IBM Docling
-            **kwargs: Additional extraction parameters
+    def __init__(self, min_confidence_threshold: float = 0.6, process_workers: int = 0):
+        super().__init__(min_confidence_threshold, process_workers)
 
-        Returns:
-            List of extracted tables
-        """
-        tables = []
-        try:
-            # Process each page
-            for page_num, page_content in enumerate(parsed_content.get("pages", []), 1):
-                page_tables = await self._extract_page_tables(
-                    document_id, page_num, page_content
-                )
-                tables.extend(page_tables)
-        except Exception as e:
-            self.logger.error(f"Error extracting tables: {str(e)}")
-            raise
-
-        return tables
-
-    async def _extract_page_tables(
+    def _extract_page_tables(
         self,
         document_id: str,
         page_num: int,
@@ -53,13 +116,15 @@ class RuleBasedTableExtractor(TableExtractor):
         """Extract tables from a single page using rule-based methods."""
         tables = []
         
-        # Find potential table regions using layout analysis
-        table_regions = self._find_table_regions(page_content)
+        # Scan the page's elements once and share the result between
+        # region detection and caption lookup
+        page = self._prepare_page(page_content)
+        table_regions = self._find_table_regions(page)
         
-        for region in table_regions:
+        for region_index, region in enumerate(table_regions):
             try:
-                table = await self._process_table_region(
-                    document_id, page_num, region, page_content
+                table = self._process_table_region(
+                    document_id, page_num, region, page_content, region_index, page.captions
                 )
                 if table:
                     tables.append(table)
@@ -70,7 +135,7 @@ class RuleBasedTableExtractor(TableExtractor):
 
         return tables
 
-    def _find_table_regions(self, page_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _find_table_regions(self, page: PageIndex) -> List[Dict[str, Any]]:
         """
         Find potential table regions using rule-based layout analysis.
         
@@ -81,124 +146,115 @@ class RuleBasedTableExtractor(TableExtractor):
         4. Line segments that might indicate table borders
         """
         regions = []
-        layout = page_content.get("layout", {})
-        
-        # Get all text blocks and their positions
-        text_blocks = self._get_text_blocks(layout)
-        if not text_blocks:
+        if not len(page.blocks):
             return regions
 
-        # Group blocks by vertical position (potential rows)
-        rows = self._group_blocks_into_rows(text_blocks)
-        
+        # Screen every row of the page at once; only rows that end up in a
+        # region are turned back into block dicts
+        is_table_row = self._potential_table_rows(page.blocks, page.rows)
+
         # Analyze each group of rows for table-like characteristics
         current_region = []
-        for row in rows:
-            if self._is_potential_table_row(row):
+        for row, table_like in zip(page.rows, is_table_row.tolist()):
+            if table_like:
                 current_region.append(row)
             elif current_region:
                 # End of potential table region
                 if len(current_region) >= 2:  # Minimum 2 rows for a table
-                    region = self._create_region_from_rows(current_region)
+                    region = self._create_region_from_rows(page.blocks.rows(current_region))
                     regions.append(region)
                 current_region = []
 
         # Handle last region
         if current_region and len(current_region) >= 2:
-            region = self._create_region_from_rows(current_region)
+            region = self._create_region_from_rows(page.blocks.rows(current_region))
             regions.append(region)
 
         return regions
 
-    def _get_text_blocks(self, layout: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract and normalize text blocks from layout."""
-        blocks = []
-        for element in layout.get("elements", []):
-            if element.get("type") == "text":
+    def _prepare_page(self, page_content: Dict[str, Any]) -> PageIndex:
+        """
+        Collect a page's text blocks and caption candidates in a single pass.
+
+        Blocks are sorted by position and stored column-wise, then grouped
+        into rows; caption candidates keep their layout order.
+        """
+        elements = []
+        captions = []
+        for element in page_content.get("layout", {}).get("elements", []):
+            if element.get("type") != "text":
+                continue
+            text = element.get("text", "")
+            if CAPTION_RE.match(text):
+                if len(text.strip()) < 200 and element.get("bbox"):
+                    captions.append((element["bbox"], text))
                 # Skip if it looks like a caption
-                text = element.get("text", "").strip().lower()
-                if text.startswith("table ") and ":" in text:
+                if ":" in text:
                     continue
-                    
-                # Extract text and position information
-                text_info = {
-                    "text": element.get("text", ""),
-                    "bbox": element.get("bbox", [0, 0, 0, 0]),
-                    "font": element.get("font"),
-                    "font_size": element.get("font_size")
-                }
-                blocks.append(text_info)
-        return sorted(blocks, key=lambda x: (x["bbox"][1], x["bbox"][0]))
-
-    def _group_blocks_into_rows(
-        self,
-        blocks: List[Dict[str, Any]],
-        y_tolerance: float = 5.0
-    ) -> List[List[Dict[str, Any]]]:
-        """Group blocks into rows based on vertical position."""
-        if not blocks:
-            return []
-
-        # Sort blocks by y-coordinate
-        sorted_blocks = sorted(blocks, key=lambda b: b["bbox"][1])
-        
-        rows = []
-        current_row = [sorted_blocks[0]]
-        current_y = sorted_blocks[0]["bbox"][1]
+            elements.append(element)
 
-        for block in sorted_blocks[1:]:
-            block_y = block["bbox"][1]
-            if abs(block_y - current_y) <= y_tolerance:
-                current_row.append(block)
-            else:
-                rows.append(current_row)
-                current_row = [block]
-                current_y = block_y
-
-        if current_row:
-            rows.append(current_row)
-
-        return rows
+        blocks = PageBlocks.from_elements(elements)
+        if len(blocks):
+            # Sort by (y, x); lexsort is stable like sorted()
+            order = np.lexsort((blocks.bbox[:, 0], blocks.bbox[:, 1]))
+            blocks = blocks.take(order)
+        # Group blocks by vertical position (potential rows)
+        return PageIndex(blocks, _row_slices(blocks.bbox[:, 1], ROW_Y_TOLERANCE), captions)
 
-    def _is_potential_table_row(
+    def _potential_table_rows(
         self,
-        row: List[Dict[str, Any]],
+        blocks: "PageBlocks",
+        rows: List[slice],
         min_cells: int = 2,
         max_variance: float = 0.2
-    ) -> bool:
+    ) -> np.ndarray:
         """
-        Check if a row of blocks might be part of a table.
+        Check which rows of blocks might be part of a table.
+
+        Rows are consecutive, non-empty slices over the blocks, as produced
+        by _prepare_page.
         
         Criteria:
         1. Minimum number of cells
         2. Regular horizontal spacing
-        3. Similar text lengths
-        4. Consistent formatting
+        3. Consistent formatting
         """
-        if len(row) < min_cells:
-            return False
-
-        # Check horizontal spacing regularity
-        spaces = []
-        for i in range(len(row) - 1):
-            space = row[i + 1]["bbox"][0] - row[i]["bbox"][2]
-            spaces.append(space)
-
-        if not spaces:
-            return False
-
-        # Calculate spacing variance
-        avg_space = sum(spaces) / len(spaces)
-        variance = sum((s - avg_space) ** 2 for s in spaces) / len(spaces)
-        if variance / avg_space > max_variance:
-            return False
-
-        # Check formatting consistency
-        fonts = set(block.get("font") for block in row)
-        font_sizes = set(block.get("font_size") for block in row)
-        
-        # Allow some variation in formatting
-        return len(fonts) <= 2 and len(font_sizes) <= 2
+        if not rows:
+            return np.zeros(0, dtype=bool)
+
+        starts = np.fromiter((row.start for row in rows), dtype=np.intp, count=len(rows))
+        ends = np.fromiter((row.stop for row in rows), dtype=np.intp, count=len(rows))
+        counts = ends - starts
+
+        # Horizontal gap after each block, zeroed at the end of each row so
+        # per-row sums only see gaps between the row's own blocks
+        bbox = blocks.bbox[starts[0]:ends[-1]]
+        gaps = np.zeros(len(bbox))
+        gaps[:-1] = bbox[1:, 0] - bbox[:-1, 2]
+        gaps[ends - starts[0] - 1] = 0.0
+        offsets = starts - starts[0]
+        num_gaps = np.maximum(counts - 1, 1)
+        avg_space = np.add.reduceat(gaps, offsets) / num_gaps
+        variance = np.maximum(
+            0.0, np.add.reduceat(gaps * gaps, offsets) / num_gaps - avg_space * avg_space
+        )
+
+        # Abutting blocks (no gaps) are running text rather than table columns
+        regular = counts >= max(min_cells, 2)
+        regular &= avg_space != 0
+        ratio = np.divide(variance, avg_space, out=np.zeros_like(variance), where=avg_space != 0)
+        regular &= ~(ratio > max_variance)
+
+        # Allow some variation in formatting: at most two fonts and sizes per row
+        row_ids = np.repeat(np.arange(len(rows)), counts)
+        for ids, num_ids in (
+            (blocks.font_id, blocks.num_fonts),
+            (blocks.font_size_id, blocks.num_font_sizes),
+        ):
+            distinct = np.unique(row_ids * num_ids + ids[starts[0]:ends[-1]]) // num_ids
+            regular &= np.bincount(distinct, minlength=len(rows)) <= 2
+
+        return regular
 
     def _create_region_from_rows(
         self,
@@ -235,104 +291,69 @@ class RuleBasedTableExtractor(TableExtractor):
             return 0.0
 
         factors = [
-            self._calculate_structure_confidence(rows),
-            self._calculate_alignment_confidence(rows),
-            self._calculate_format_confidence(rows),
+            *self._calculate_confidences(rows),
             self._calculate_content_confidence(rows)
         ]
         
         return sum(factors) / len(factors)
 
-    def _calculate_structure_confidence(
+    def _calculate_confidences(
         self,
         rows: List[List[Dict[str, Any]]]
-    ) -> float:
-        """Calculate confidence based on structural regularity."""
+    ) -> Tuple[float, float, float]:
+        """Calculate structure, alignment and format confidence in one pass over the rows."""
         if not rows:
-            return 0.0
-
-        # Check row length consistency
-        row_lengths = [len(row) for row in rows]
-        if not row_lengths:
-            return 0.0
-
-        avg_length = sum(row_lengths) / len(row_lengths)
-        if avg_length < 2:  # Require at least 2 columns
-            return 0.0
-
-        # Calculate variance in row lengths
-        variance = sum((l - avg_length) ** 2 for l in row_lengths) / len(row_lengths)
-        
-        # Higher confidence for consistent row lengths
-        return max(0.0, 1.0 - (variance / avg_length))
-
-    def _calculate_alignment_confidence(
-        self,
-        rows: List[List[Dict[str, Any]]]
-    ) -> float:
-        """Calculate confidence based on alignment consistency."""
-        if not rows:
-            return 0.0
-
-        # Get column x-positions for each row
-        col_positions = []
-        for row in rows:
-            positions = [block["bbox"][0] for block in row]
-            col_positions.append(positions)
-
-        # Calculate alignment consistency
-        if not col_positions:
-            return 0.0
-
-        reference_pos = col_positions[0]
-        alignment_scores = []
-
-        for pos in col_positions[1:]:
-            if len(pos) != len(reference_pos):
-                alignment_scores.append(0.0)
-                continue
-
-            # Calculate position differences
-            diffs = [abs(p - r) for p, r in zip(pos, reference_pos)]
-            avg_diff = sum(diffs) / len(diffs)
-            alignment_scores.append(max(0.0, 1.0 - (avg_diff / 50.0)))  # 50px tolerance
-
-        return sum(alignment_scores) / len(alignment_scores) if alignment_scores else 0.0
-
-    def _calculate_format_confidence(
-        self,
-        rows: List[List[Dict[str, Any]]]
-    ) -> float:
-        """Calculate confidence based on formatting patterns."""
-        if not rows:
-            return 0.0
-
-        # Analyze header formatting
-        potential_header = rows[0]
-        header_format = {
-            "font": set(block.get("font") for block in potential_header),
-            "font_size": set(block.get("font_size") for block in potential_header)
-        }
-
-        # Analyze body formatting
-        body_format = {
-            "font": set(block.get("font") for row in rows[1:] for block in row),
-            "font_size": set(block.get("font_size") for row in rows[1:] for block in row)
-        }
-
-        # Higher confidence if header and body have distinct formatting
+            return 0.0, 0.0, 0.0
+
+        header = rows[0]
+        reference_pos = [block["bbox"][0] for block in header]
+        num_cols = len(reference_pos)
+
+        # Running row-length statistics (Welford), seeded with the header row
+        count, avg_length, m2 = 1, float(num_cols), 0.0
+        alignment_total = 0.0
+        aligned_rows = 0
+        body_fonts = set()
+        body_font_sizes = set()
+        for row in rows[1:]:
+            length = len(row)
+            count += 1
+            delta = length - avg_length
+            avg_length += delta / count
+            m2 += delta * (length - avg_length)
+
+            # Compare column x-positions with the header's;
+            # rows with a different number of columns score 0
+            if length == num_cols:
+                avg_diff = sum(
+                    abs(block["bbox"][0] - ref) for block, ref in zip(row, reference_pos)
+                ) / num_cols
+                alignment_total += max(0.0, 1.0 - avg_diff / 50.0)  # 50px tolerance
+                aligned_rows += 1
+
+            for block in row:
+                body_fonts.add(block.get("font"))
+                body_font_sizes.add(block.get("font_size"))
+
+        # Structure: higher confidence for consistent row lengths of at least 2 columns
+        if avg_length < 2:
+            structure = 0.0
+        else:
+            structure = max(0.0, 1.0 - (m2 / count) / avg_length)
+
+        alignment = alignment_total / (len(rows) - 1) if aligned_rows else 0.0
+
+        # Format: header distinct from the body, and a consistent body
+        header_fonts = {block.get("font") for block in header}
+        header_font_sizes = {block.get("font_size") for block in header}
         format_diff_score = (
-            (len(header_format["font"] - body_format["font"]) > 0) +
-            (len(header_format["font_size"] - body_format["font_size"]) > 0)
+            bool(header_fonts - body_fonts) + bool(header_font_sizes - body_font_sizes)
         ) / 2.0
-
-        # Higher confidence if body formatting is consistent
         body_consistency = (
-            (len(body_format["font"]) <= 2) +
-            (len(body_format["font_size"]) <= 2)
+            (len(body_fonts) <= 2) + (len(body_font_sizes) <= 2)
         ) / 2.0
 
-        return (format_diff_score + body_consistency) / 2.0
+        return structure, alignment, (format_diff_score + body_consistency) / 2.0
 
     def _calculate_content_confidence(
         self,
@@ -342,46 +363,29 @@ class RuleBasedTableExtractor(TableExtractor):
         if not rows:
             return 0.0
 
-        # Analyze content length patterns
-        col_lengths = []
-        for col_idx in range(len(rows[0])):
-            col_content = []
-            for row in rows:
-                if col_idx < len(row):
-                    col_content.append(len(row[col_idx].get("text", "")))
-            if col_content:
-                col_lengths.append(col_content)
-
-        if not col_lengths:
-            return 0.0
-
-        # Calculate consistency within columns
+        # Calculate consistency of content lengths within columns
         col_scores = []
-        for lengths in col_lengths:
-            if not lengths:
-                continue
-            avg_length = sum(lengths) / len(lengths)
-            variance = sum((l - avg_length) ** 2 for l in lengths) / len(lengths)
-            col_scores.append(max(0.0, 1.0 - (variance / (avg_length + 1))))
+        for col_idx in range(len(rows[0])):
+            count, avg_length, variance = _mean_variance(
+                len(row[col_idx].get("text", "")) for row in rows if col_idx < len(row)
+            )
+            if count:
+                col_scores.append(max(0.0, 1.0 - (variance / (avg_length + 1))))
 
         return sum(col_scores) / len(col_scores) if col_scores else 0.0
 
-    async def _process_table_region(
+    def _process_table_region(
         self,
         document_id: str,
         page_num: int,
         region: Dict[str, Any],
-        page_content: Dict[str, Any]
+        page_content: Dict[str, Any],
+        region_index: int = 0,
+        captions: Optional[List[Tuple[List[float], str]]] = None
     ) -> Optional[Table]:
         """Process a table region into a structured Table object."""
         try:
-            # Extract cells from rows
-            cells, num_rows, num_cols = await self._extract_cells(region)
-            
-            if not cells:
-                return None
-
-            # Calculate confidence score
+            # Check the region's confidence before building any cells
             confidence_score = region.get("confidence", 0.0)
             
             if confidence_score < self.min_confidence_threshold:
@@ -391,15 +395,21 @@ class RuleBasedTableExtractor(TableExtractor):
                 )
                 return None
 
+            # Extract cells from rows
+            cells, num_rows, num_cols = self._extract_cells(region)
+            
+            if not cells:
+                return None
+
             # Create table object
             table = Table(
-                id=f"table-{document_id}-{page_num}-{uuid4().hex[:8]}",
+                id=self._table_id(document_id, page_num, region_index),
                 document_id=document_id,
                 page_number=page_num,
                 cells=cells,
                 num_rows=num_rows,
                 num_cols=num_cols,
-                caption=self._extract_caption(region, page_content),
+                caption=self._extract_caption(region, page_content, captions),
                 detection_method=TableDetectionMethod.RULE_BASED,
                 confidence_score=confidence_score,
                 bbox=region.get("bbox"),
@@ -415,7 +425,7 @@ class RuleBasedTableExtractor(TableExtractor):
             self.logger.error(f"Error processing table region: {str(e)}")
             return None
 
-    async def _extract_cells(
+    def _extract_cells(
         self,
         region: Dict[str, Any]
     ) -> Tuple[List[TableCell], int, int]:
@@ -450,21 +460,21 @@ class RuleBasedTableExtractor(TableExtractor):
     def _extract_caption(
         self,
         region: Dict[str, Any],
-        page_content: Dict[str, Any]
+        page_content: Dict[str, Any],
+        captions: Optional[List[Tuple[List[float], str]]] = None
     ) -> Optional[str]:
         """Extract table caption if available."""
         bbox = region.get("bbox")
         if not bbox:
             return None
 
+        if captions is None:
+            captions = self._prepare_page(page_content).captions
+
         # Look for caption-like text above or below the table
-        for element in page_content.get("layout", {}).get("elements", []):
-            if element.get("type") == "text":
-                text = element.get("text", "").strip().lower()
-                if text.startswith("table ") and len(text) < 200:
-                    element_bbox = element.get("bbox")
-                    if element_bbox and self._is_nearby(bbox, element_bbox):
-                        return element.get("text")
+        for element_bbox, text in captions:
+            if self._is_nearby(bbox, element_bbox):
+                return text
 
         return None
 
@@ -496,31 +506,21 @@ class RuleBasedTableExtractor(TableExtractor):
             if table.num_rows < 2 or table.num_cols < 2:
                 return False
 
-            # Verify cell positions
-            for cell in table.cells:
-                if (cell.row < 0 or cell.row >= table.num_rows or
-                    cell.col < 0 or cell.col >= table.num_cols):
-                    return False
+            # Verify cell positions on whole columns of cell attributes at once
+            arrays = table.cell_arrays()
+            rows, cols = arrays.rows, arrays.cols
+            if ((rows < 0).any() or (rows >= table.num_rows).any() or
+                (cols < 0).any() or (cols >= table.num_cols).any()):
+                return False
 
             # Check for minimum content
-            non_empty_cells = sum(1 for cell in table.cells if cell.text.strip())
+            non_empty_cells = sum(1 for text in arrays.text if text.strip())
             if non_empty_cells / len(table.cells) < 0.5:  # Require 50% non-empty cells
                 return False
 
-            # Check for consistent column count and complete rows
-            rows = {}
-            for cell in table.cells:
-                rows.setdefault(cell.row, []).append(cell)
-            
-            # Each row should have the expected number of columns
-            if not all(len(row) == table.num_cols for row in rows.values()):
-                return False
-
-            # All rows from 0 to num_rows-1 should be present
-            if set(rows.keys()) != set(range(table.num_rows)):
-                return False
-
-            return True
+            # All rows from 0 to num_rows-1 should be present, each with the
+            # expected number of columns
+            return bool((np.bincount(rows, minlength=table.num_rows) == table.num_cols).all())
 
         except Exception as e:
             self.logger.error(f"Error validating table: {str(e)}")
@@ -1,6 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
-from uuid import uuid4
 
 from .base import TableExtractor
 from .models.table import Table, TableDetectionMethod
@@ -18,6 +18,10 @@ class TableExtractionService:
         self._extractors[method] = extractor
         self.logger.info(f"Registered table extractor for method: {method}")
 
+    def get_extractor(self, method: TableDetectionMethod) -> Optional[TableExtractor]:
+        """Return the extractor registered for a method, if any."""
+        return self._extractors.get(method)
+
     async def extract_tables(
         self,
         document_id: str,
@@ -44,137 +48,171 @@ class TableExtractionService:
             raise ValueError("No table extractors registered")
 
         # Use preferred method if specified and available
-        if preferred_method and preferred_method in self._extractors:
-            extractor = self._extractors[preferred_method]
+        extractor = self.get_extractor(preferred_method) if preferred_method else None
+        if extractor is not None:
             tables = await extractor.extract_tables(
                 document_id, parsed_content, **kwargs
             )
             return await self._validate_tables(tables, extractor)
 
-        # Try AI-driven first, then rule-based, and merge results
-        tables = []
-        ai_tables = []
-        rule_based_tables = []
-
-        # Try AI-driven extraction first
-        if TableDetectionMethod.AI_DRIVEN in self._extractors:
-            try:
-                extractor = self._extractors[TableDetectionMethod.AI_DRIVEN]
-                ai_tables = await extractor.extract_tables(
-                    document_id, parsed_content, **kwargs
-                )
-                ai_tables = await self._validate_tables(ai_tables, extractor)
-            except Exception as e:
-                self.logger.error(f"Error during AI-driven extraction: {str(e)}")
-                # AI extraction failed, continue to rule-based
-
-        # If AI extraction failed or found no tables, try rule-based
-        if (not ai_tables) and TableDetectionMethod.RULE_BASED in self._extractors:
-            try:
-                extractor = self._extractors[TableDetectionMethod.RULE_BASED]
-                rule_based_tables = await extractor.extract_tables(
-                    document_id, parsed_content, **kwargs
-                )
-                rule_based_tables = await self._validate_tables(rule_based_tables, extractor)
-            except Exception as e:
-                self.logger.error(f"Error during rule-based extraction: {str(e)}")
-
-        # Merge results, preferring AI-driven results when there's overlap
-        try:
-            tables = await self._merge_table_results(ai_tables, rule_based_tables)
-        except Exception as e:
-            self.logger.error(f"Error merging table results: {str(e)}")
-            # On merge error, return whatever results we have
-            tables = ai_tables + rule_based_tables
-
-        return tables
+        # Rule-based results are only used when AI extraction fails or
+        # finds no tables, so only run it then
+        ai_tables = await self._extract_and_validate(
+            TableDetectionMethod.AI_DRIVEN, "AI-driven", document_id, parsed_content, **kwargs
+        )
+        if ai_tables:
+            return ai_tables
+        return await self._extract_and_validate(
+            TableDetectionMethod.RULE_BASED, "rule-based", document_id, parsed_content, **kwargs
+        )
 
-    async def _merge_table_results(
+    async def iter_tables(
         self,
-        ai_tables: List[Table],
-        rule_based_tables: List[Table]
-    ) -> List[Table]:
-        """
-        Merge results from both extractors, handling overlaps.
-        
-        Strategy:
-        1. Keep all AI tables with high confidence
-        2. Add rule-based tables that don't overlap with AI tables
-        3. For overlapping regions, keep the one with higher confidence
+        document_id: str,
+        parsed_content: Dict[str, Any],
+        preferred_method: Optional[TableDetectionMethod] = None,
+        **kwargs
+    ) -> AsyncIterator[Table]:
         """
-        if not rule_based_tables:
-            return ai_tables
-        if not ai_tables:
-            return rule_based_tables
+        Extract and validate tables one at a time, so they can be consumed
+        or persisted without holding the whole document's tables.
 
-        merged_tables = []
-        used_regions = set()
+        Without a preferred method, AI-driven tables are streamed first and
+        rule-based extraction runs only if AI extraction yields no valid
+        table. Once a table has been yielded it cannot be retracted, so an
+        AI failure part-way through ends the stream without falling back.
 
-        # Add all high-confidence AI tables
-        for table in ai_tables:
-            if table.confidence_score >= 0.8:
-                merged_tables.append(table)
-                if table.bbox:
-                    used_regions.add(self._bbox_to_key(table.bbox))
+        Args:
+            document_id: Unique identifier of the document
+            parsed_content: Parsed document content from IBM Docling
+            preferred_method: Preferred extraction method to use
+            **kwargs: Additional extraction parameters
 
-        # Process remaining tables
-        remaining_ai = [t for t in ai_tables if t.confidence_score < 0.8]
-        all_remaining = remaining_ai + rule_based_tables
+        Yields:
+            Validated tables
 
-        # Sort by confidence score
-        all_remaining.sort(key=lambda t: t.confidence_score, reverse=True)
+        Raises:
+            ValueError: If no suitable extractor is available
+        """
+        if not self._extractors:
+            raise ValueError("No table extractors registered")
 
-        for table in all_remaining:
-            if not table.bbox:
-                merged_tables.append(table)
+        extractor = self.get_extractor(preferred_method) if preferred_method else None
+        if extractor is not None:
+            async for table in self._iter_validated(extractor, document_id, parsed_content, **kwargs):
+                yield table
+            return
+
+        for method, label in (
+            (TableDetectionMethod.AI_DRIVEN, "AI-driven"),
+            (TableDetectionMethod.RULE_BASED, "rule-based"),
+        ):
+            extractor = self.get_extractor(method)
+            if extractor is None:
                 continue
+            found = False
+            try:
+                async for table in self._iter_validated(
+                    extractor, document_id, parsed_content, **kwargs
+                ):
+                    found = True
+                    yield table
+            except Exception as e:
+                self.logger.error(f"Error during {label} extraction: {str(e)}")
+            if found:
+                return
 
-            bbox_key = self._bbox_to_key(table.bbox)
-            if bbox_key not in used_regions and not self._has_overlap(table, merged_tables):
-                merged_tables.append(table)
-                used_regions.add(bbox_key)
+    async def _iter_validated(
+        self,
+        extractor: TableExtractor,
+        document_id: str,
+        parsed_content: Dict[str, Any],
+        **kwargs
+    ) -> AsyncIterator[Table]:
+        """Stream an extractor's tables, dropping the ones that fail validation."""
+        async for table in extractor.iter_tables(document_id, parsed_content, **kwargs):
+            if extractor.tables_prevalidated or await self._is_valid(table, extractor):
+                yield table
+
+    async def _is_valid(self, table: Table, extractor: TableExtractor) -> bool:
+        """Validate a single table, logging why it was rejected."""
+        try:
+            if await extractor.validate_table(table):
+                return True
+            self.logger.warning(
+                f"Table validation failed for table {table.id} "
+                f"in document {table.document_id}"
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error validating table {table.id}: {str(e)}"
+            )
+        return False
 
-        return merged_tables
+    async def _extract_and_validate(
+        self,
+        method: TableDetectionMethod,
+        label: str,
+        document_id: str,
+        parsed_content: Dict[str, Any],
+        **kwargs
+    ) -> List[Table]:
+        """Extract and validate tables with one method, returning no tables on error."""
+        extractor = self.get_extractor(method)
+        if extractor is None:
+            return []
+        try:
+            tables = await extractor.extract_tables(document_id, parsed_content, **kwargs)
+            return await self._validate_tables(tables, extractor)
+        except Exception as e:
+            self.logger.error(f"Error during {label} extraction: {str(e)}")
+            return []
 
-    def _bbox_to_key(self, bbox: List[float]) -> str:
-        """Convert bbox to string key for comparison."""
-        return f"{int(bbox[0])},{int(bbox[1])},{int(bbox[2])},{int(bbox[3])}"
+    async def extract_tables_batch(
+        self,
+        documents: List[Tuple[str, Dict[str, Any]]],
+        preferred_method: Optional[TableDetectionMethod] = None,
+        **kwargs
+    ) -> Dict[str, List[Table]]:
+        """
+        Extract tables from a batch of parsed documents.
 
-    def _has_overlap(self, table: Table, existing_tables: List[Table]) -> bool:
-        """Check if table overlaps with any existing tables."""
-        if not table.bbox:
-            return False
+        Args:
+            documents: (document_id, parsed_content) pairs
+            preferred_method: Preferred extraction method to use
+            **kwargs: Additional extraction parameters
 
-        for existing in existing_tables:
-            if not existing.bbox:
-                continue
+        Returns:
+            Extracted tables keyed by document ID
 
-            # Check for overlap
-            if (table.bbox[0] < existing.bbox[2] and
-                table.bbox[2] > existing.bbox[0] and
-                table.bbox[1] < existing.bbox[3] and
-                table.bbox[3] > existing.bbox[1]):
-                return True
+        Raises:
+            ValueError: If no suitable extractor is available
+        """
+        if not self._extractors:
+            raise ValueError("No table extractors registered")
 
-        return False
+        # Resolve the preferred extractor once and hand it the whole batch
+        extractor = self.get_extractor(preferred_method) if preferred_method else None
+        if extractor is not None:
+            results = await extractor.extract_many(documents, **kwargs)
+            return {
+                document_id: await self._validate_tables(tables, extractor)
+                for document_id, tables in results.items()
+            }
+
+        # Otherwise apply the per-document fallback strategy
+        return {
+            document_id: await self.extract_tables(document_id, parsed_content, **kwargs)
+            for document_id, parsed_content in documents
+        }
 
     async def _validate_tables(
         self, tables: List[Table], extractor: TableExtractor
     ) -> List[Table]:
         """Validate extracted tables and filter out invalid ones."""
-        validated_tables = []
-        for table in tables:
-            try:
-                if await extractor.validate_table(table):
-                    validated_tables.append(table)
-                else:
-                    self.logger.warning(
-                        f"Table validation failed for table {table.id} "
-                        f"in document {table.document_id}"
-                    )
-            except Exception as e:
-                self.logger.error(
-                    f"Error validating table {table.id}: {str(e)}"
-                )
-
-        return validated_tables
\ No newline at end of file
+        if extractor.tables_prevalidated:
+            return tables
+        results = await asyncio.gather(
+            *(self._is_valid(table, extractor) for table in tables)
+        )
+        return [table for table, valid in zip(tables, results) if valid]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from docuflow.config.config import settings
+from docuflow.config import settings
 
 def main():
     print("Current Settings:")
@@ -1,15 +1,34 @@
-import os
+import asyncio
 import shutil
 import tempfile
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
+from pytest_asyncio import is_async_test
 
 from docuflow.api.main import app
 from docuflow.ingestion.service import IngestionService
 
 
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop shared with the session fixtures."""
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop where it is installed (it ships with uvicorn[standard])."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -18,28 +37,36 @@ def temp_dir():
     shutil.rmtree(temp_dir)
 
 
-@pytest.fixture
-def test_upload_dir(temp_dir):
-    """Create a temporary upload directory."""
-    upload_dir = Path(temp_dir) / "uploads"
-    upload_dir.mkdir(parents=True)
-    yield str(upload_dir)
+@pytest.fixture(scope="session")
+def test_upload_dir(tmp_path_factory):
+    """Create a temporary upload directory for the session."""
+    return str(tmp_path_factory.mktemp("uploads"))
 
 
-@pytest.fixture
-def test_processed_dir(temp_dir):
-    """Create a temporary processed directory."""
-    processed_dir = Path(temp_dir) / "processed"
-    processed_dir.mkdir(parents=True)
-    yield str(processed_dir)
+@pytest.fixture(scope="session")
+def test_processed_dir(tmp_path_factory):
+    """Create a temporary processed directory for the session."""
+    return str(tmp_path_factory.mktemp("processed"))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ingestion_service(test_upload_dir, test_processed_dir):
-    """Create an IngestionService instance with test directories."""
+    """Create an IngestionService instance shared by the whole session."""
     return IngestionService(test_upload_dir, test_processed_dir)
 
 
+@pytest.fixture
+def ingest_limit():
+    """Maximum number of ingestions a test runs concurrently."""
+    return 32
+
+
+@pytest.fixture
+def ingest_sem(ingest_limit):
+    """Bound the number of ingestions a test runs concurrently."""
+    return asyncio.Semaphore(ingest_limit)
+
+
 @pytest.fixture
 def test_client():
     """Create a TestClient instance."""
@@ -53,7 +80,7 @@ def sample_pdf():
     with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
         f.write(content)
         yield f.name
-    os.unlink(f.name)
+    Path(f.name).unlink(missing_ok=True)
 
 
 @pytest.fixture
@@ -63,4 +90,4 @@ def sample_docx():
     with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as f:
         f.write(content)
         yield f.name
-    os.unlink(f.name)
\ No newline at end of file
+    Path(f.name).unlink(missing_ok=True)
\ No newline at end of file
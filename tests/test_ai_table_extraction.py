@@ -233,4 +233,84 @@ async def test_merged_cells(docling_extractor):
     # Verify merged cell
     merged_header = next(cell for cell in table.cells if cell.colspan > 1)
     assert merged_header.text == "Merged Header"
-    assert merged_header.colspan == 2
\ No newline at end of file
+    assert merged_header.colspan == 2
+    assert table.num_rows == 2
+    assert table.num_cols == 2
+
+
+@pytest.mark.parametrize("cells,expected_extent", [
+    ([], (0, 0)),
+    ([{"text": "A", "row": 0, "col": 0, "rowspan": 3, "confidence": 0.9}], (3, 1)),
+    ([
+        {"text": "A", "row": 0, "col": 0, "confidence": 0.9},
+        {"text": "B", "row": 1, "col": 2, "colspan": 2, "confidence": 0.9}
+    ], (2, 4)),
+], ids=["empty", "rowspan", "colspan"])
+def test_explicit_table_extent(docling_extractor, cells, expected_extent):
+    """Test that the table extent covers every cell's full span."""
+    _, num_rows, num_cols = docling_extractor._extract_cells({"type": "table", "cells": cells})
+    assert (num_rows, num_cols) == expected_extent
+
+
+@pytest.mark.asyncio
+async def test_implicit_table_position_tolerance(docling_extractor, sample_implicit_table_output):
+    """Test that text within the 5-pixel tolerance maps to the anchor it is near."""
+    blocks = sample_implicit_table_output["pages"][0]["layout"]["elements"][0]["blocks"]
+    blocks[1]["text"][0]["x"] = 53
+    blocks[1]["text"][1]["y"] = 102
+    
+    tables = await docling_extractor.extract_tables("test-doc", sample_implicit_table_output)
+    
+    assert len(tables) == 1
+    table = tables[0]
+    # Every distinct position stays an anchor, even when no cell maps to it
+    assert table.num_rows == 3
+    assert table.num_cols == 3
+    positions = {cell.text: (cell.row, cell.col) for cell in table.cells}
+    assert positions["Value 1"] == (1, 0)
+    assert positions["Value 2"] == (1, 2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ys,expected_rows", [
+    ((100, 104, 108, 112), [0, 0, 1, 2]),  # Evenly spaced tight rows do not chain together
+    ((100, 105), [0, 1]),  # Exactly 5 pixels apart is outside the tolerance
+], ids=["tight", "edge"])
+async def test_implicit_table_row_anchors(docling_extractor, sample_implicit_table_output, ys, expected_rows):
+    """Test that each row takes the first row anchor within 5 pixels of it."""
+    sample_implicit_table_output["pages"][0]["layout"]["elements"][0]["blocks"] = [
+        {
+            "text": [
+                {"content": f"R{i}C{j}", "x": x, "y": y, "font": "Arial", "font_size": 10}
+                for j, x in enumerate((50, 200))
+            ]
+        }
+        for i, y in enumerate(ys)
+    ]
+    
+    tables = await docling_extractor.extract_tables("test-doc", sample_implicit_table_output)
+    
+    assert len(tables) == 1
+    table = tables[0]
+    assert table.num_rows == len(ys)
+    assert table.num_cols == 2
+    rows = {cell.text: cell.row for cell in table.cells}
+    assert [rows[f"R{i}C0"] for i in range(len(ys))] == expected_rows
+    assert [rows[f"R{i}C1"] for i in range(len(ys))] == expected_rows
+
+
+@pytest.mark.asyncio
+async def test_nearby_caption(docling_extractor, sample_docling_output):
+    """Test that a nearby 'Table ...' text block is used as the caption."""
+    elements = sample_docling_output["pages"][0]["layout"]["elements"]
+    del elements[0]["caption"]
+    elements[0]["bbox"] = [50, 100, 500, 300]
+    elements.extend([
+        {"type": "text", "text": "Table 2: Far away", "bbox": [50, 600, 500, 620]},
+        {"type": "text", "text": "Table 1: Quarterly results", "bbox": [50, 70, 500, 90]}
+    ])
+    
+    tables = await docling_extractor.extract_tables("test-doc", sample_docling_output)
+    
+    assert len(tables) == 1
+    assert tables[0].caption == "Table 1: Quarterly results"
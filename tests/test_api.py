@@ -3,6 +3,10 @@ import os
 import pytest
 from fastapi import status
 
+from docuflow.api.main import MULTIPART_OVERHEAD
+from docuflow.api.routes import documents
+from docuflow.config import settings
+
 
 def test_root_endpoint(test_client):
     """Test the root endpoint."""
@@ -41,6 +45,53 @@ def test_upload_docx(test_client, sample_docx):
     assert data["status"] == "pending"
 
 
+def test_upload_too_large(test_client, monkeypatch):
+    """Test that oversized uploads are rejected."""
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+    files = {"file": ("large.pdf", b"%PDF-1.4\n" + b"0" * 64, "application/pdf")}
+    response = test_client.post("/documents/upload", files=files)
+    
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_upload_unsupported_extension(test_client):
+    """Test that files with disallowed extensions are rejected."""
+    files = {"file": ("notes.xyz", b"Some random content", "application/octet-stream")}
+    response = test_client.post("/documents/upload", files=files)
+    
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+def test_upload_declared_too_large(test_client, monkeypatch):
+    """Test that a body declared too large is rejected before any of it is read."""
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+    response = test_client.post(
+        "/documents/upload",
+        content=b"",
+        headers={
+            "content-type": "multipart/form-data; boundary=unread",
+            "content-length": str(10 + MULTIPART_OVERHEAD + 1),
+        },
+    )
+    
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {"detail": "File too large"}
+
+
+@pytest.mark.parametrize("filename", ["page.htm", "scan.tif", "logo.gif", "chart.bmp"])
+def test_upload_accepts_supported_extensions(test_client, monkeypatch, filename):
+    """Test that every extension the ingestion service supports passes the allowlist."""
+    async def ingest_file(file):
+        raise ValueError(f"ingested {file.filename}")
+
+    monkeypatch.setattr(documents.ingestion_service, "ingest_file", ingest_file)
+    files = {"file": (filename, b"content", "application/octet-stream")}
+    response = test_client.post("/documents/upload", files=files)
+    
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": f"ingested {filename}"}
+
+
 def test_get_nonexistent_document(test_client):
     """Test getting a document that doesn't exist."""
     # Test with valid UUID format
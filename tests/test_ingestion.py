@@ -1,62 +1,54 @@
+import asyncio
+import io
 import os
+import tempfile
 from pathlib import Path
+from typing import Optional
 
 import pytest
 from fastapi import UploadFile
+from starlette.datastructures import Headers
 
 from docuflow.ingestion.service import IngestionService
 
 from docuflow.models.document import DocumentType
 
 
-@pytest.mark.asyncio
-async def test_ingest_pdf(ingestion_service, sample_pdf):
-    """Test ingesting a PDF file."""
-    # Create an UploadFile instance
-    with open(sample_pdf, "rb") as f:
-        upload_file = UploadFile(
-            filename=os.path.basename(sample_pdf),
-            file=f
-        )
-        
-        # Test ingestion
-        doc = await ingestion_service.ingest_file(upload_file)
-        
-        # Verify document metadata
-        assert doc.filename == os.path.basename(sample_pdf)
-        assert doc.file_type == DocumentType.PDF
-        assert os.path.exists(doc.file_path)
-        assert doc.processed_path is None
+def _upload(filename: str, data: bytes, content_type: Optional[str] = None) -> UploadFile:
+    """Wrap in-memory bytes in an UploadFile, optionally declaring its content type."""
+    headers = Headers({"content-type": content_type}) if content_type else None
+    return UploadFile(filename=filename, file=io.BytesIO(data), size=len(data), headers=headers)
 
 
 @pytest.mark.asyncio
-async def test_ingest_docx(ingestion_service, sample_docx):
-    """Test ingesting a DOCX file."""
+@pytest.mark.parametrize("fixture_name,content_type,file_type", [
+    ("sample_pdf", "application/pdf", DocumentType.PDF),
+    ("sample_docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", DocumentType.DOCX),
+])
+async def test_ingest_sample_file(ingestion_service, request, fixture_name, content_type, file_type):
+    """Test ingesting PDF and DOCX sample files."""
+    sample_path = request.getfixturevalue(fixture_name)
     # Create an UploadFile instance
-    with open(sample_docx, "rb") as f:
-        upload_file = UploadFile(
-            filename=os.path.basename(sample_docx),
-            file=f
-        )
-        
-        # Test ingestion
-        doc = await ingestion_service.ingest_file(upload_file)
-        
-        # Verify document metadata
-        assert doc.filename == os.path.basename(sample_docx)
-        assert doc.file_type == DocumentType.DOCX
-        assert os.path.exists(doc.file_path)
-        assert doc.processed_path is None
+    upload_file = _upload(os.path.basename(sample_path), Path(sample_path).read_bytes(), content_type)
+
+    # Test ingestion
+    doc = await ingestion_service.ingest_file(upload_file)
+
+    # Verify document metadata
+    assert doc.filename == os.path.basename(sample_path)
+    assert doc.file_type == file_type
+    assert os.path.exists(doc.file_path)
+    assert doc.processed_path is None
 
 
 def test_directory_creation(temp_dir):
     """Test that the service creates required directories."""
     upload_dir = Path(temp_dir) / "test_upload"
     processed_dir = Path(temp_dir) / "test_processed"
-    
+
     # Create service instance
     service = IngestionService(str(upload_dir), str(processed_dir))
-    
+
     # Check directories were created
     assert upload_dir.exists()
     assert upload_dir.is_dir()
@@ -65,69 +57,103 @@ def test_directory_creation(temp_dir):
 
 
 @pytest.mark.asyncio
-async def test_ingest_image(ingestion_service, temp_dir):
-    """Test ingesting an image file."""
-    # Create a sample image file
-    image_path = Path(temp_dir) / "test.jpg"
-    with open(image_path, "wb") as f:
-        f.write(b"\xFF\xD8\xFF")  # JPEG signature
-    
-    with open(image_path, "rb") as f:
-        upload_file = UploadFile(
-            filename="test.jpg",
-            file=f
-        )
-        
-        # Test ingestion
-        doc = await ingestion_service.ingest_file(upload_file)
-        
-        # Verify document metadata
-        assert doc.filename == "test.jpg"
-        assert doc.file_type == DocumentType.IMAGE
-        assert os.path.exists(doc.file_path)
+@pytest.mark.parametrize("filename,data,content_type,file_type", [
+    ("test.jpg", b"\xFF\xD8\xFF", "image/jpeg", DocumentType.IMAGE),  # JPEG signature
+    ("test.html", b"<!DOCTYPE html><html><body>Test</body></html>", "text/html", DocumentType.HTML),
+    ("test.xyz", b"Some random content", None, DocumentType.UNKNOWN),
+])
+async def test_ingest_upload(ingestion_service, filename, data, content_type, file_type):
+    """Test ingesting image, HTML and unknown-type uploads."""
+    upload_file = _upload(filename, data, content_type)
 
+    # Test ingestion
+    doc = await ingestion_service.ingest_file(upload_file)
 
-@pytest.mark.asyncio
-async def test_ingest_html(ingestion_service, temp_dir):
-    """Test ingesting an HTML file."""
-    # Create a sample HTML file
-    html_path = Path(temp_dir) / "test.html"
-    with open(html_path, "w") as f:
-        f.write("<!DOCTYPE html><html><body>Test</body></html>")
-    
-    with open(html_path, "rb") as f:
-        upload_file = UploadFile(
-            filename="test.html",
-            file=f
-        )
-        
-        # Test ingestion
-        doc = await ingestion_service.ingest_file(upload_file)
-        
-        # Verify document metadata
-        assert doc.filename == "test.html"
-        assert doc.file_type == DocumentType.HTML
-        assert os.path.exists(doc.file_path)
+    # Verify document metadata
+    assert doc.filename == filename
+    assert doc.file_type == file_type
+    assert os.path.exists(doc.file_path)
 
 
 @pytest.mark.asyncio
-async def test_ingest_unknown_type(ingestion_service, temp_dir):
-    """Test ingesting a file with unknown type."""
-    # Create a sample file with unknown type
+async def test_ingest_concurrent(ingestion_service, ingest_sem, ingest_limit, monkeypatch):
+    """Test ingesting many uploads concurrently, at most the semaphore's limit at a time."""
+    in_flight = peak = 0
+    ingest_file = ingestion_service.ingest_file
+
+    # Count whole ingestions rather than the threaded saves, which the
+    # default executor would cap on its own
+    async def counting_ingest_file(upload_file):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await ingest_file(upload_file)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(ingestion_service, "ingest_file", counting_ingest_file)
+
+    async def ingest(upload_file):
+        async with ingest_sem:
+            return await ingestion_service.ingest_file(upload_file)
+
+    filenames = [f"test_{i}.jpg" for i in range(64)]
+    docs = await asyncio.gather(*(ingest(_upload(name, b"\xFF\xD8\xFF")) for name in filenames))
+
+    # Verify every upload was stored and typed
+    assert [doc.filename for doc in docs] == filenames
+    assert all(doc.file_type == DocumentType.IMAGE for doc in docs)
+    assert all(os.path.exists(doc.file_path) for doc in docs)
+    # Ingestions overlapped, but never more than the semaphore allows
+    assert 1 < peak <= ingest_limit
+
+
+def test_detection_fallback(ingestion_service, temp_dir):
+    """Test the declared content type is used only when the header has no known signature."""
     file_path = Path(temp_dir) / "test.xyz"
-    with open(file_path, "w") as f:
-        f.write("Some random content")
-    
-    with open(file_path, "rb") as f:
-        upload_file = UploadFile(
-            filename="test.xyz",
-            file=f
-        )
-        
-        # Test ingestion
-        doc = await ingestion_service.ingest_file(upload_file)
-        
-        # Verify document metadata
-        assert doc.filename == "test.xyz"
-        assert doc.file_type == DocumentType.UNKNOWN
-        assert os.path.exists(doc.file_path)
\ No newline at end of file
+    file_path.write_bytes(b"Some random content")
+
+    assert ingestion_service._detect_file_type(str(file_path), "text/html; charset=utf-8") == DocumentType.HTML
+    assert ingestion_service._detect_file_type(str(file_path), "application/octet-stream") == DocumentType.UNKNOWN
+    assert ingestion_service._detect_file_type(str(file_path)) == DocumentType.UNKNOWN
+
+    # Signatures win over a mismatched declaration
+    file_path.write_bytes(b"%PDF-1.4")
+    assert ingestion_service._detect_file_type(str(file_path), "text/html") == DocumentType.PDF
+
+
+def test_save_upload_sendfile_fallback(ingestion_service, temp_dir, monkeypatch):
+    """Test that a failing sendfile falls back to a buffered copy of the whole file."""
+    source_path = Path(temp_dir) / "source.bin"
+    source_path.write_bytes(b"x" * 1000)
+
+    def failing_sendfile(out_fd, in_fd, offset, count):
+        os.write(out_fd, b"partial")
+        raise OSError("sendfile not supported")
+
+    monkeypatch.setattr(os, "sendfile", failing_sendfile, raising=False)
+
+    target_path = Path(temp_dir) / "target.bin"
+    with open(source_path, "rb") as source:
+        ingestion_service._save_upload(source, target_path)
+
+    assert target_path.read_bytes() == b"x" * 1000
+
+
+def test_save_upload_in_memory_spool(ingestion_service, temp_dir, monkeypatch):
+    """Test that an upload still held in memory is copied without rolling it over to disk."""
+    def unexpected_sendfile(out_fd, in_fd, offset, count):
+        raise AssertionError("sendfile used for an in-memory upload")
+
+    monkeypatch.setattr(os, "sendfile", unexpected_sendfile, raising=False)
+
+    source = tempfile.SpooledTemporaryFile(max_size=1024)
+    source.write(b"x" * 100)
+    source.seek(0)
+
+    target_path = Path(temp_dir) / "target.bin"
+    ingestion_service._save_upload(source, target_path)
+
+    assert target_path.read_bytes() == b"x" * 100
+    assert not source._rolled
@@ -1,214 +1,103 @@
-import os
-import shutil
-from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
-from PIL import Image
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import Image as RLImage
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+import pytest_asyncio
 
 from docuflow.models.document import Document, DocumentStatus, DocumentType
 from docuflow.parsing.service import DocumentParsingService
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
 
 @pytest.fixture(scope="session")
-def test_files_dir():
-    """Create and manage test files directory."""
-    test_dir = Path("/workspace/DocuFlow/tests/test_files")
-    test_dir.mkdir(parents=True, exist_ok=True)
-    yield test_dir
-    if test_dir.exists():
-        shutil.rmtree(test_dir)
-
-
-@pytest.fixture
-def sample_image(test_files_dir):
-    """Create a test image with some text and shapes."""
-    image_path = test_files_dir / "test_image.png"
-    
-    # Create a simple image with text and shapes
-    img = Image.new('RGB', (800, 600), color='white')
-    from PIL import ImageDraw, ImageFont
-    draw = ImageDraw.Draw(img)
-    
-    # Add some shapes
-    draw.rectangle([100, 100, 300, 200], outline='black', width=2)
-    draw.ellipse([400, 100, 600, 200], outline='blue', width=2)
-    draw.line([100, 300, 700, 300], fill='red', width=3)
-    
-    # Add text
-    draw.text((50, 50), "Test Image Content", fill='black', size=24)
-    draw.text((50, 400), "Sample Text", fill='blue', size=18)
-    
-    # Save with high quality
-    img.save(image_path, quality=95, optimize=True)
-    
-    yield image_path
-    
-    if image_path.exists():
-        os.remove(image_path)
+def test_files_dir(tmp_path_factory):
+    """Create a temporary test files directory for the session."""
+    return tmp_path_factory.mktemp("test_files")
 
 
-@pytest.fixture
-def complex_pdf(test_files_dir, sample_image):
-    """Create a complex PDF with tables, images, and formatted text."""
-    pdf_path = test_files_dir / "complex_test.pdf"
-    
-    # Create PDF with multiple elements
-    doc = SimpleDocTemplate(
-        str(pdf_path),
-        pagesize=letter,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=18
-    )
-    
-    # Prepare styles
-    styles = getSampleStyleSheet()
-    
-    # Build content
-    story = []
-    
-    # Add title
-    story.append(Paragraph("Complex Test Document", styles['Title']))
-    story.append(Spacer(1, 12))
-    
-    # Add some text with formatting
-    story.append(Paragraph("This is a test document with various elements:", styles['Normal']))
-    story.append(Spacer(1, 12))
-    
-    # Add a code block
-    code_text = '''def example_function():
-    print("This is a code block")
-    return True'''
-    story.append(Paragraph("Code Example:", styles['Heading2']))
-    story.append(Paragraph(f"<code>{code_text}</code>", styles['Code']))
-    story.append(Spacer(1, 12))
-    
-    # Add a table
-    table_data = [
-        ['Header 1', 'Header 2', 'Header 3'],
-        ['Row 1', '123', 'abc'],
-        ['Row 2', '456', 'def'],
-        ['Row 3', '789', 'ghi']
-    ]
-    table = Table(table_data)
-    table.setStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ])
-    story.append(Paragraph("Sample Table:", styles['Heading2']))
-    story.append(table)
-    story.append(Spacer(1, 12))
-    
-    # Add an image
-    img = RLImage(str(sample_image), width=4*inch, height=3*inch)
-    story.append(Paragraph("Sample Image:", styles['Heading2']))
-    story.append(img)
-    story.append(Spacer(1, 12))
-    
-    # Add another image to ensure multiple images are handled
-    img2 = RLImage(str(sample_image), width=3*inch, height=2*inch)
-    story.append(Paragraph("Another Image:", styles['Heading2']))
-    story.append(img2)
-    story.append(Spacer(1, 12))
-    
-    # Add a formula
-    story.append(Paragraph("Sample Formula:", styles['Heading2']))
-    story.append(Paragraph("E = mc<sup>2</sup>", styles['Normal']))
-    story.append(Paragraph("Another formula: x<sup>2</sup> + y<sup>2</sup> = r<sup>2</sup>", styles['Normal']))
-    
-    # Build the PDF
-    doc.build(story)
-    
-    yield pdf_path
-    
-    if pdf_path.exists():
-        os.remove(pdf_path)
+@pytest.fixture(scope="session")
+def sample_image():
+    """Test image with some text and shapes (see scripts/generate_fixtures.py)."""
+    return FIXTURES_DIR / "test_image.png"
+
+
+@pytest.fixture(scope="session")
+def complex_pdf():
+    """Complex PDF with tables, images, and formatted text (see scripts/generate_fixtures.py)."""
+    return FIXTURES_DIR / "complex_test.pdf"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def parsing_service():
-    """Create a DocumentParsingService instance."""
+    """Create a DocumentParsingService instance shared by the whole session."""
     return DocumentParsingService()
 
 
-@pytest.mark.asyncio
-async def test_simple_text_parsing(test_files_dir):
-    """Test parsing a simple PDF with just text."""
-    # Create a simple PDF
-    pdf_path = test_files_dir / "simple_test.pdf"
-    c = SimpleDocTemplate(str(pdf_path))
-    story = []
-    styles = getSampleStyleSheet()
-    story.append(Paragraph("Simple Test Document", styles['Title']))
-    story.append(Paragraph("This is a test PDF file.", styles['Normal']))
-    c.build(story)
-    
-    # Create document and parse
+@pytest.fixture(scope="session")
+def simple_pdf():
+    """Simple PDF with just text (see scripts/generate_fixtures.py)."""
+    return FIXTURES_DIR / "simple_test.pdf"
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def simple_parsed(simple_pdf, parsing_service):
+    """Parse the simple PDF from memory once per session."""
     doc = Document(
         filename="simple_test.pdf",
         file_type=DocumentType.PDF,
-        file_path=str(pdf_path)
+        file_path=str(simple_pdf)
     )
-    
-    parsing_service = DocumentParsingService()
-    result = await parsing_service.parse_document(doc, pdf_path)
-    
-    # Verify results
-    assert result.status == DocumentStatus.PROCESSED
-    assert result.content is not None
-    assert "Simple Test Document" in result.content
-    assert result.metadata["num_pages"] == 1
-    assert not result.metadata["has_tables"]
-    assert not result.metadata["has_images"]
-    assert not result.metadata["has_code"]
-    assert not result.metadata["has_formulas"]
-    assert isinstance(result.metadata["processing_time"], str)
-    
-    # Cleanup
-    os.remove(pdf_path)
+    return await parsing_service.parse_document_bytes(doc, simple_pdf.read_bytes())
 
 
-@pytest.mark.asyncio
-async def test_complex_document_parsing(complex_pdf, parsing_service):
-    """Test parsing a complex PDF with tables, images, and code."""
-    # Create document
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def complex_parsed(complex_pdf, parsing_service):
+    """Parse the complex PDF from memory once per session."""
     doc = Document(
         filename="complex_test.pdf",
         file_type=DocumentType.PDF,
         file_path=str(complex_pdf)
     )
-    
-    # Parse document
-    result = await parsing_service.parse_document(doc, complex_pdf)
+    return await parsing_service.parse_document_bytes(doc, complex_pdf.read_bytes())
+
+
+@pytest.mark.parametrize("parsed_fixture,title,expected", [
+    ("simple_parsed", "Simple Test Document", {
+        "num_pages": 1,
+        "has_tables": False,
+        "has_images": False,
+        "has_code": False,
+        "has_formulas": False,
+    }),
+    ("complex_parsed", "Complex Test Document", {
+        "has_tables": True,
+        "has_images": True,
+        "has_code": True,
+        "has_formulas": True,
+    }),
+])
+def test_pdf_parsing(request, parsed_fixture, title, expected):
+    """Test parsing a simple text PDF and a complex PDF with tables, images, and code."""
+    result = request.getfixturevalue(parsed_fixture)
     
     # Verify basic results
     assert result.status == DocumentStatus.PROCESSED
     assert result.content is not None
+    assert title in result.content
     assert result.error is None
     
     # Check metadata
     assert result.metadata["num_pages"] >= 1
-    assert result.metadata["has_tables"]
-    assert result.metadata["has_images"]
-    assert result.metadata["has_code"]
-    assert result.metadata["has_formulas"]
+    assert expected.items() <= result.metadata.items()
     
-    # Check table extraction
-    assert "tables" in result.metadata
-    tables = result.metadata["tables"]
+    # Check processing time
+    assert result.metadata["processing_time"].endswith(("+00:00", "Z"))  # ISO 8601 in UTC
+
+
+def test_complex_table_extraction(complex_parsed):
+    """Test table metadata extracted from the complex PDF."""
+    assert "tables" in complex_parsed.metadata
+    tables = complex_parsed.metadata["tables"]
     assert len(tables) > 0
     table = tables[0]
     assert "headers" in table
@@ -216,20 +105,16 @@ async def test_complex_document_parsing(complex_pdf, parsing_service):
     assert "num_rows" in table
     assert table["num_rows"] >= 4  # Header + 3 data rows
     assert "bbox" in table
-    
-    # Check image extraction
-    assert "images" in result.metadata
-    images = result.metadata["images"]
+
+
+def test_complex_image_extraction(complex_parsed):
+    """Test image metadata extracted from the complex PDF."""
+    assert "images" in complex_parsed.metadata
+    images = complex_parsed.metadata["images"]
     assert len(images) > 0
     image = images[0]
     assert "page" in image
     assert "bbox" in image
-    
-    # Check processing time
-    assert "processing_time" in result.metadata
-    processing_time = datetime.fromisoformat(result.metadata["processing_time"])
-    assert isinstance(processing_time, datetime)
-    assert processing_time.tzinfo == UTC
 
 
 @pytest.mark.asyncio
@@ -243,7 +128,7 @@ async def test_image_document_parsing(sample_image, parsing_service):
     )
     
     # Parse document
-    result = await parsing_service.parse_document(doc, sample_image)
+    result = await parsing_service.parse_document_bytes(doc, sample_image.read_bytes())
     
     # Verify results
     assert result.status == DocumentStatus.PROCESSED
@@ -263,13 +148,78 @@ async def test_image_document_parsing(sample_image, parsing_service):
     assert "captions" in image
 
 
+@pytest.mark.asyncio
+async def test_batch_parsing(complex_pdf, test_files_dir, parsing_service):
+    """Test streaming batch parsing of valid and invalid documents."""
+    invalid_pdf = test_files_dir / "invalid_batch.pdf"
+    invalid_pdf.write_text("This is not a valid PDF file")
+    
+    docs = [
+        Document(filename="complex_test.pdf", file_type=DocumentType.PDF, file_path=str(complex_pdf)),
+        Document(filename="invalid_batch.pdf", file_type=DocumentType.PDF, file_path=str(invalid_pdf)),
+    ]
+    
+    results = {doc.filename: doc async for doc in parsing_service.parse_documents(docs)}
+    
+    assert set(results) == {"complex_test.pdf", "invalid_batch.pdf"}
+    assert results["complex_test.pdf"].status == DocumentStatus.PROCESSED
+    assert results["complex_test.pdf"].metadata["has_tables"]
+    assert results["invalid_batch.pdf"].status == DocumentStatus.FAILED
+    assert results["invalid_batch.pdf"].error is not None
+    
+    # Cleanup
+    invalid_pdf.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_batch_parsing_stamps_each_document(test_files_dir, parsing_service, monkeypatch):
+    """Test that each document in a batch is stamped when its own conversion finishes."""
+    import time
+    from types import SimpleNamespace
+
+    paths = [test_files_dir / "first_stamp.pdf", test_files_dir / "second_stamp.pdf"]
+
+    def convert_all(sources, **kwargs):
+        for source in sources:
+            time.sleep(0.01)  # Each conversion takes a while
+            yield SimpleNamespace(input=SimpleNamespace(file=source))
+
+    def apply_conversion_result(document, result):
+        document.status = DocumentStatus.PROCESSED
+
+    monkeypatch.setattr(parsing_service, "_ensure_converter", lambda: SimpleNamespace(convert_all=convert_all))
+    monkeypatch.setattr(parsing_service, "_apply_conversion_result", apply_conversion_result)
+    docs = [
+        Document(filename=path.name, file_type=DocumentType.PDF, file_path=str(path))
+        for path in paths
+    ]
+
+    results = [doc async for doc in parsing_service.parse_documents(docs)]
+
+    assert [doc.status for doc in results] == [DocumentStatus.PROCESSED] * 2
+    assert results[0].process_time < results[1].process_time
+
+
+@pytest.mark.asyncio
+async def test_parse_many(complex_pdf, sample_image, parsing_service):
+    """Test concurrent parsing keeps results in input order."""
+    pairs = [
+        (Document(filename="complex_test.pdf", file_type=DocumentType.PDF, file_path=str(complex_pdf)), complex_pdf),
+        (Document(filename="test_image.png", file_type=DocumentType.IMAGE, file_path=str(sample_image)), sample_image),
+    ]
+    
+    results = await parsing_service.parse_many(pairs, max_concurrency=2)
+    
+    assert [doc.filename for doc in results] == ["complex_test.pdf", "test_image.png"]
+    assert all(doc.status == DocumentStatus.PROCESSED for doc in results)
+
+
 @pytest.mark.asyncio
 async def test_error_handling(test_files_dir, parsing_service):
     """Test error handling with invalid files."""
     # Create an invalid PDF file
     invalid_pdf = test_files_dir / "invalid.pdf"
-    with open(invalid_pdf, "w") as f:
-        f.write("This is not a valid PDF file")
+    invalid_pdf.write_text("This is not a valid PDF file")
     
     # Create document
     doc = Document(
@@ -287,21 +237,17 @@ async def test_error_handling(test_files_dir, parsing_service):
     assert "failed" in result.error.lower()
     
     # Cleanup
-    os.remove(invalid_pdf)
+    invalid_pdf.unlink(missing_ok=True)
 
 
 @pytest.mark.asyncio
-async def test_partial_success_handling(complex_pdf, parsing_service):
+async def test_partial_success_handling(complex_pdf, test_files_dir, parsing_service):
     """Test handling of partial success cases."""
     # Create a corrupted PDF by truncating it
-    corrupted_pdf = complex_pdf.parent / "corrupted.pdf"
-    shutil.copy(complex_pdf, corrupted_pdf)
-    with open(corrupted_pdf, "r+b") as f:
-        # Get file size
-        f.seek(0, 2)  # Seek to end
-        size = f.tell()
-        # Truncate to half size
-        f.truncate(size // 2)
+    corrupted_pdf = test_files_dir / "corrupted.pdf"
+    data = complex_pdf.read_bytes()
+    # Keep only the first half
+    corrupted_pdf.write_bytes(data[:len(data) // 2])
     
     # Create document
     doc = Document(
@@ -323,4 +269,45 @@ async def test_partial_success_handling(complex_pdf, parsing_service):
         assert result.error is not None
     
     # Cleanup
-    os.remove(corrupted_pdf)
\ No newline at end of file
+    corrupted_pdf.unlink(missing_ok=True)
+
+
+def test_picture_classifications_deduplicated(parsing_service):
+    """Repeated classes keep only their highest confidence."""
+    from types import SimpleNamespace
+
+    def predicted(name, confidence):
+        return SimpleNamespace(class_name=name, confidence=confidence)
+
+    picture = SimpleNamespace(
+        prov=[],
+        captions=[],
+        annotations=[
+            SimpleNamespace(predicted_classes=[predicted("chart", 0.4), predicted("logo", 0.9)]),
+            SimpleNamespace(predicted_classes=[predicted("chart", 0.8)])
+        ]
+    )
+    
+    picture_data = parsing_service._extract_picture_data(picture, 1)
+    
+    assert picture_data["classifications"] == [
+        {"class": "chart", "confidence": 0.8},
+        {"class": "logo", "confidence": 0.9}
+    ]
+
+
+@pytest.mark.parametrize("markdown,num_rows", [
+    ("| A | B |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |", 3),
+    ("| A | B |\n| 1 | 2 |\n| 3 | 4 |", 2),
+], ids=["separator", "no-separator"])
+def test_table_row_count(parsing_service, markdown, num_rows):
+    """num_rows counts every markdown line after the header, as Docling renders it."""
+    from types import SimpleNamespace
+
+    table = SimpleNamespace(prov=[], export_to_markdown=lambda: markdown)
+
+    table_data = parsing_service._extract_table_data(table, 1)
+
+    assert table_data["headers"] == ["A", "B"]
+    assert table_data["num_rows"] == num_rows
+    assert table_data["num_cols"] == 2
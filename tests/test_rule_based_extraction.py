@@ -1,17 +1,18 @@
 import pytest
-from typing import Dict, Any
+import pytest_asyncio
+from typing import Dict, Any, List
 
-from docuflow.table_extraction.rule_based import RuleBasedTableExtractor
-from docuflow.table_extraction.models.table import TableDetectionMethod
+from docuflow.table_extraction.rule_based import PageBlocks, RuleBasedTableExtractor
+from docuflow.table_extraction.models.table import Table, TableDetectionMethod
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rule_based_extractor():
     """Create a RuleBasedTableExtractor instance."""
     return RuleBasedTableExtractor()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_layout_content() -> Dict[str, Any]:
     """Create sample layout content with grid-like text blocks."""
     return {
@@ -94,7 +95,7 @@ def sample_layout_content() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def irregular_layout_content() -> Dict[str, Any]:
     """Create sample layout content with irregular text blocks."""
     return {
@@ -128,10 +129,15 @@ def irregular_layout_content() -> Dict[str, Any]:
     }
 
 
-@pytest.mark.asyncio
-async def test_extract_regular_table(rule_based_extractor, sample_layout_content):
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def regular_tables(rule_based_extractor, sample_layout_content) -> List[Table]:
+    """Extract the tables of the sample layout once per session."""
+    return await rule_based_extractor.extract_tables("test-doc", sample_layout_content)
+
+
+def test_extract_regular_table(regular_tables):
     """Test extraction of regular grid-like table structure."""
-    tables = await rule_based_extractor.extract_tables("test-doc", sample_layout_content)
+    tables = regular_tables
     
     assert len(tables) == 1
     table = tables[0]
@@ -159,10 +165,9 @@ async def test_irregular_layout(rule_based_extractor, irregular_layout_content):
     assert len(tables) == 0
 
 
-@pytest.mark.asyncio
-async def test_confidence_calculation(rule_based_extractor, sample_layout_content):
+def test_confidence_calculation(rule_based_extractor, sample_layout_content, regular_tables):
     """Test confidence score calculation for rule-based extraction."""
-    tables = await rule_based_extractor.extract_tables("test-doc", sample_layout_content)
+    tables = regular_tables
     assert len(tables) == 1
     
     table = tables[0]
@@ -170,27 +175,21 @@ async def test_confidence_calculation(rule_based_extractor, sample_layout_conten
     # Check confidence factors
     assert table.confidence_score >= 0.7  # High confidence for regular grid
     
-    # Get the blocks for confidence calculation
-    blocks = rule_based_extractor._get_text_blocks(
-        sample_layout_content["pages"][0]["layout"]
-    )
-    rows = rule_based_extractor._group_blocks_into_rows(blocks)
+    # Get the rows for confidence calculation from the same single pass
+    # over the page that extraction uses
+    page = rule_based_extractor._prepare_page(sample_layout_content["pages"][0])
+    rows = page.blocks.rows(page.rows)
     
     # Verify confidence components
-    structure_conf = rule_based_extractor._calculate_structure_confidence(rows)
+    structure_conf, alignment_conf, format_conf = rule_based_extractor._calculate_confidences(rows)
     assert structure_conf > 0.8  # High structure confidence for regular grid
-    
-    alignment_conf = rule_based_extractor._calculate_alignment_confidence(rows)
     assert alignment_conf > 0.8  # High alignment confidence for regular grid
-    
-    format_conf = rule_based_extractor._calculate_format_confidence(rows)
     assert format_conf > 0.7  # Good format confidence (header vs data)
 
 
-@pytest.mark.asyncio
-async def test_caption_extraction(rule_based_extractor, sample_layout_content):
+def test_caption_extraction(regular_tables):
     """Test extraction of table caption."""
-    tables = await rule_based_extractor.extract_tables("test-doc", sample_layout_content)
+    tables = regular_tables
     assert len(tables) == 1
     
     table = tables[0]
@@ -198,12 +197,12 @@ async def test_caption_extraction(rule_based_extractor, sample_layout_content):
 
 
 @pytest.mark.asyncio
-async def test_validation(rule_based_extractor, sample_layout_content):
+async def test_validation(rule_based_extractor, regular_tables):
     """Test table validation logic."""
-    tables = await rule_based_extractor.extract_tables("test-doc", sample_layout_content)
-    assert len(tables) == 1
+    assert len(regular_tables) == 1
     
-    table = tables[0]
+    # Copy, since the table is shared and its cells are cut below
+    table = regular_tables[0].model_copy(deep=True)
     is_valid = await rule_based_extractor.validate_table(table)
     assert is_valid
     
@@ -214,16 +213,33 @@ async def test_validation(rule_based_extractor, sample_layout_content):
 
 
 @pytest.mark.asyncio
-async def test_empty_document(rule_based_extractor):
-    """Test handling of empty document."""
-    empty_doc = {"pages": [{"layout": {"elements": []}}]}
-    tables = await rule_based_extractor.extract_tables("test-doc", empty_doc)
+@pytest.mark.parametrize("doc", [
+    {"pages": [{"layout": {"elements": []}}]},  # Empty document
+    {"invalid": "structure"},  # Invalid input
+], ids=["empty", "invalid"])
+async def test_no_tables(rule_based_extractor, doc):
+    """Test handling of empty documents and invalid input."""
+    tables = await rule_based_extractor.extract_tables("test-doc", doc)
     assert len(tables) == 0
 
 
+def test_abutting_blocks_not_table_row(rule_based_extractor):
+    """Test that a row with no gaps between blocks is rejected without error."""
+    row = [
+        {"text": "A", "bbox": [0, 0, 50, 10], "font": "Arial", "font_size": 10},
+        {"text": "B", "bbox": [50, 0, 100, 10], "font": "Arial", "font_size": 10},
+        {"text": "C", "bbox": [100, 0, 150, 10], "font": "Arial", "font_size": 10}
+    ]
+    blocks = PageBlocks.from_elements(row)
+    assert not rule_based_extractor._potential_table_rows(blocks, [slice(0, len(row))])[0]
+
+
 @pytest.mark.asyncio
-async def test_invalid_input(rule_based_extractor):
-    """Test handling of invalid input."""
-    invalid_doc = {"invalid": "structure"}
-    tables = await rule_based_extractor.extract_tables("test-doc", invalid_doc)
-    assert len(tables) == 0
\ No newline at end of file
+async def test_iter_tables(rule_based_extractor, sample_layout_content, regular_tables):
+    """Test that streaming extraction yields the same tables as extract_tables."""
+    streamed = [
+        table async for table in rule_based_extractor.iter_tables("test-doc", sample_layout_content)
+    ]
+    tables = regular_tables
+    
+    assert [t.model_dump() for t in streamed] == [t.model_dump() for t in tables]
@@ -1,5 +1,4 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
 
 from docuflow.table_extraction import (
     TableExtractionService,
@@ -8,6 +7,8 @@ from docuflow.table_extraction import (
     TableCell,
     TableDetectionMethod,
 )
+from docuflow.table_extraction.ai_driven import DoclingTableExtractor
+from docuflow.table_extraction.rule_based import RuleBasedTableExtractor
 
 
 class MockTableExtractor(TableExtractor):
@@ -28,9 +29,9 @@ class MockTableExtractor(TableExtractor):
         return self.validation_result
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_table():
-    """Create a sample table for testing."""
+    """Create a sample table shared by the module's tests."""
     return Table(
         id="test-table-1",
         document_id="test-doc-1",
@@ -48,18 +49,59 @@ def sample_table():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def table_service():
-    """Create a TableExtractionService instance."""
+    """Create a TableExtractionService instance shared by the module's tests."""
     return TableExtractionService()
 
 
+@pytest.fixture(scope="module")
+def mixed_layout_content():
+    """Create a page with an explicit table and a grid of text blocks, so each extractor finds a table."""
+    def text_block(text, x, y):
+        return {"type": "text", "text": text, "bbox": [x, y, x + 80, y + 20], "font": "Arial", "font_size": 10}
+
+    explicit_rows = [("Name", "Age"), ("John", "30"), ("Jane", "25")]
+    grid_rows = [("Name", "Age", "City"), ("John", "30", "Boston"), ("Jane", "25", "Denver")]
+    return {
+        "pages": [{
+            "layout": {
+                "elements": [
+                    {
+                        "type": "table",
+                        "bbox": [50, 300, 400, 400],
+                        "cells": [
+                            {"text": text, "row": row, "col": col, "is_header": row == 0, "confidence": 0.9}
+                            for row, cells in enumerate(explicit_rows)
+                            for col, text in enumerate(cells)
+                        ]
+                    },
+                    *(
+                        text_block(text, 50 + 150 * col, 50 + 30 * row)
+                        for row, cells in enumerate(grid_rows)
+                        for col, text in enumerate(cells)
+                    )
+                ]
+            }
+        }]
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_extractors(table_service):
+    """Unregister the extractors each test registers on the shared service."""
+    yield
+    table_service._extractors.clear()
+
+
 @pytest.mark.asyncio
 async def test_register_extractor(table_service):
     """Test registering an extractor."""
     mock_extractor = MockTableExtractor()
     table_service.register_extractor(TableDetectionMethod.AI_DRIVEN, mock_extractor)
     assert TableDetectionMethod.AI_DRIVEN in table_service._extractors
+    assert table_service.get_extractor(TableDetectionMethod.AI_DRIVEN) is mock_extractor
+    assert table_service.get_extractor(TableDetectionMethod.RULE_BASED) is None
 
 
 @pytest.mark.asyncio
@@ -84,8 +126,11 @@ async def test_extract_tables_ai_driven(table_service, sample_table):
 async def test_extract_tables_fallback(table_service, sample_table):
     """Test fallback to rule-based extraction when AI fails."""
     # AI extractor that raises an exception
+    async def _raise(*args, **kwargs):
+        raise RuntimeError("AI failed")
+
     ai_extractor = MockTableExtractor()
-    ai_extractor.extract_tables = AsyncMock(side_effect=Exception("AI failed"))
+    ai_extractor.extract_tables = _raise
 
     # Rule-based extractor that works
     rule_extractor = MockTableExtractor(tables_to_return=[sample_table])
@@ -100,6 +145,25 @@ async def test_extract_tables_fallback(table_service, sample_table):
     assert rule_extractor.extract_tables_called
 
 
+@pytest.mark.asyncio
+async def test_extract_tables_prefers_ai(table_service, sample_table):
+    """Test that rule-based extraction is skipped when AI extraction finds tables."""
+    rule_table = sample_table.model_copy(update={
+        "id": "test-table-2",
+        "detection_method": TableDetectionMethod.RULE_BASED,
+    })
+    table_service.register_extractor(
+        TableDetectionMethod.AI_DRIVEN, MockTableExtractor(tables_to_return=[sample_table])
+    )
+    rule_extractor = MockTableExtractor(tables_to_return=[rule_table])
+    table_service.register_extractor(TableDetectionMethod.RULE_BASED, rule_extractor)
+
+    tables = await table_service.extract_tables("test-doc-1", {"content": "test content"})
+
+    assert [table.id for table in tables] == [sample_table.id]
+    assert not rule_extractor.extract_tables_called
+
+
 @pytest.mark.asyncio
 async def test_validate_tables(table_service, sample_table):
     """Test table validation filtering."""
@@ -119,6 +183,22 @@ async def test_validate_tables(table_service, sample_table):
     assert len(tables) == 0  # All tables should be filtered out due to validation failure
 
 
+@pytest.mark.asyncio
+async def test_extract_tables_batch(table_service, sample_table):
+    """Test batch extraction with a preferred method."""
+    mock_extractor = MockTableExtractor(tables_to_return=[sample_table])
+    table_service.register_extractor(TableDetectionMethod.AI_DRIVEN, mock_extractor)
+
+    results = await table_service.extract_tables_batch(
+        [("test-doc-1", {"content": "one"}), ("test-doc-2", {"content": "two"})],
+        preferred_method=TableDetectionMethod.AI_DRIVEN
+    )
+
+    assert set(results) == {"test-doc-1", "test-doc-2"}
+    assert all(len(tables) == 1 for tables in results.values())
+    assert mock_extractor.validate_table_called
+
+
 @pytest.mark.asyncio
 async def test_table_to_markdown(sample_table):
     """Test converting table to markdown format."""
@@ -139,4 +219,84 @@ async def test_table_to_dict_format(sample_table):
         ["Header 1", "Header 2"],
         ["Data 1", "Data 2"]
     ]
-    assert grid == expected
\ No newline at end of file
+    assert grid == expected
+
+
+@pytest.mark.asyncio
+async def test_table_cell_arrays(sample_table):
+    """Test the column-wise view of table cells."""
+    arrays = sample_table.cell_arrays()
+    assert arrays.rows.tolist() == [0, 0, 1, 1]
+    assert arrays.cols.tolist() == [0, 1, 0, 1]
+    assert arrays.rowspans.tolist() == [1, 1, 1, 1]
+    assert arrays.text == ["Header 1", "Header 2", "Data 1", "Data 2"]
+
+
+@pytest.mark.asyncio
+async def test_table_dict_format_tracks_cells(sample_table):
+    """Test that the grid reflects cell changes and is not shared between calls."""
+    table = sample_table.model_copy(deep=True)
+    grid = table.to_dict_format()
+    grid[0][0] = "caller-mutated"
+    assert table.to_dict_format()[0][0] == "Header 1"
+    assert "caller-mutated" not in table.to_markdown()
+    
+    # In-place edits of the cell list show up in the next grid
+    table.cells[0].text = "Edited"
+    table.cells[1] = TableCell(text="Replaced", row=0, col=1, is_header=True)
+    assert table.to_dict_format()[0] == ["Edited", "Replaced"]
+    
+    table.cells = table.cells[:2]
+    assert table.to_dict_format() == [
+        ["Edited", "Replaced"],
+        ["", ""]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_tables_fallback(table_service, sample_table):
+    """Test streaming falls back to rule-based extraction when AI finds nothing valid."""
+    ai_extractor = MockTableExtractor(tables_to_return=[sample_table], validation_result=False)
+    rule_extractor = MockTableExtractor(tables_to_return=[sample_table])
+    table_service.register_extractor(TableDetectionMethod.AI_DRIVEN, ai_extractor)
+    table_service.register_extractor(TableDetectionMethod.RULE_BASED, rule_extractor)
+
+    tables = [
+        table async for table in table_service.iter_tables("test-doc-1", {"content": "test content"})
+    ]
+
+    assert [table.id for table in tables] == [sample_table.id]
+    assert ai_extractor.validate_table_called
+    assert rule_extractor.extract_tables_called
+
+
+@pytest.mark.asyncio
+async def test_prevalidated_extractor_skips_validation(table_service, sample_table):
+    """Test that tables from a pre-validated extractor are not validated again."""
+    mock_extractor = MockTableExtractor(tables_to_return=[sample_table], validation_result=False)
+    mock_extractor.tables_prevalidated = True
+    table_service.register_extractor(TableDetectionMethod.AI_DRIVEN, mock_extractor)
+
+    tables = await table_service.extract_tables(
+        "test-doc-1",
+        {"content": "test content"},
+        preferred_method=TableDetectionMethod.AI_DRIVEN
+    )
+
+    assert len(tables) == 1
+    assert not mock_extractor.validate_table_called
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extractor_cls", [DoclingTableExtractor, RuleBasedTableExtractor])
+async def test_extract_with_process_pool(extractor_cls, mixed_layout_content):
+    """Test that worker-process extraction matches in-process extraction."""
+    pooled_extractor = extractor_cls(process_workers=1)
+    try:
+        pooled = await pooled_extractor.extract_tables("test-doc", mixed_layout_content)
+    finally:
+        pooled_extractor.close()
+    tables = await extractor_cls().extract_tables("test-doc", mixed_layout_content)
+
+    assert len(pooled) == len(tables) == 1
+    assert [table.model_dump() for table in pooled] == [table.model_dump() for table in tables]